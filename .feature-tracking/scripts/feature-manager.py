@@ -7,10 +7,291 @@ Handles creation, tracking, and management of features using templates and JSON
 import json
 import os
 import sys
+import time
+import bisect
+import hashlib
+import heapq
 import argparse
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 import re
+import csv
+import glob
+import html
+import random
+import sqlite3
+import subprocess
+from array import array
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # Required by analytics; optional speed-up for duplicate detection
+    np = None
+
+EXPORT_FIELDS = {
+    'features': ['id', 'name', 'description', 'status', 'priority', 'epic', 'owner', 'estimatedHours',
+                 'tags', 'businessValue', 'technicalComplexity', 'createdDate', 'completedDate', 'linearIssue'],
+    'epics': ['id', 'name', 'description', 'status', 'priority', 'owner', 'startDate', 'targetDate',
+              'features', 'percentComplete', 'remainingHours', 'projectedFinish'],
+    'events': ['timestamp', 'featureId', 'fromStatus', 'toStatus']
+}
+NUMERIC_FIELDS = {'estimatedHours', 'percentComplete', 'remainingHours'}
+LIST_FIELDS = {'tags', 'features'}
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard usually share a bucket
+MINHASH_PRIME = (1 << 31) - 1  # Keeps a * x + b below 2**63 so NumPy can sign in uint64
+DUPLICATE_THRESHOLD = 0.5
+MINHASH_VERSION = 2  # Bump when shingling changes; stored signatures are then rebuilt
+_minhash_rng = random.Random(20250117)
+MINHASH_COEFFICIENTS = [(_minhash_rng.randrange(1, MINHASH_PRIME), _minhash_rng.randrange(MINHASH_PRIME))
+                        for _ in range(MINHASH_PERMUTATIONS)]
+if np is not None:
+    _MINHASH_A = np.array([[a] for a, _ in MINHASH_COEFFICIENTS], dtype=np.uint64)
+    _MINHASH_B = np.array([[b] for _, b in MINHASH_COEFFICIENTS], dtype=np.uint64)
+
+PRIORITY_LEVELS = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
+VALUE_LEVELS = {'high': 3, 'medium': 2, 'low': 1}
+COMPLEXITY_FACTORS = {'low': 0.75, 'medium': 1.0, 'high': 1.5}
+RANKING_WEIGHTS = {'priority': 1.0, 'value': 1.0, 'age': 0.5}  # age counts per 30 days
+
+REPORT_VERSION = 2
+REPORT_PLACEHOLDER = re.compile(r'\{(title|root|body)\}')
+REPORT_POOL_MIN_PAGES = 200  # Below this, process start-up costs more than it saves
+REPORT_LAYOUTS = {
+    'html': """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body { font-family: system-ui, sans-serif; max-width: 960px; margin: 2rem auto; padding: 0 1rem; color: #1f2937; }
+table { border-collapse: collapse; width: 100%; margin: 1rem 0; }
+th, td { border-bottom: 1px solid #e5e7eb; padding: .4rem .6rem; text-align: left; }
+pre { background: #f9fafb; padding: 1rem; overflow-x: auto; white-space: pre-wrap; }
+</style>
+</head>
+<body>
+<nav><a href="{root}index.html">ShipsMind Features</a></nav>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+""",
+    'markdown': """[ShipsMind Features]({root}index.md)
+
+# {title}
+
+{body}
+"""
+}
+
+STATUSES = ['backlog', 'planning', 'active', 'review', 'testing', 'complete']
+INDEX_VERSION = 2
+# Event log columns: name -> (array typecode, little-endian NumPy dtype)
+EVENT_COLUMNS = {
+    'ts': ('q', '<i8'),
+    'feature': ('i', '<i4'),
+    'from': ('b', 'i1'),
+    'to': ('b', 'i1')
+}
+FEATURE_DOC_PATTERN = re.compile(r'^(feat-\d+)-.*\.md$')
+TERM_PATTERN = re.compile(r'\w+')
+
+class _ReportLink(str):
+    """Pre-rendered link markup that table cells must not escape again"""
+
+
+def _report_link(file_format, href, text):
+    """Link to another report page"""
+    if file_format == 'html':
+        return _ReportLink(f'<a href="{html.escape(href)}.html">{html.escape(str(text))}</a>')
+    return _ReportLink(f"[{text}]({href}.md)")
+
+
+def _report_cell(file_format, value):
+    """Format one table cell value"""
+    if value is None or value == '':
+        return '-'
+    if isinstance(value, list):
+        value = ', '.join(str(item) for item in value) or '-'
+    if file_format == 'html':
+        return value if isinstance(value, _ReportLink) else html.escape(str(value))
+    return str(value).replace('|', '\\|').replace('\n', ' ')
+
+
+def _report_table(file_format, headers, rows):
+    """Render a table of already-linked cells"""
+    rows = [[_report_cell(file_format, value) for value in row] for row in rows]
+    if not rows:
+        return '<p>None</p>' if file_format == 'html' else '_None_'
+    if file_format == 'html':
+        head = ''.join(f"<th>{html.escape(header)}</th>" for header in headers)
+        body = ''.join('<tr>' + ''.join(f"<td>{cell}</td>" for cell in row) + '</tr>\n' for row in rows)
+        return f"<table>\n<tr>{head}</tr>\n{body}</table>"
+    lines = ['| ' + ' | '.join(headers) + ' |', '|' + '---|' * len(headers)]
+    lines.extend('| ' + ' | '.join(row) + ' |' for row in rows)
+    return '\n'.join(lines)
+
+
+def _report_heading(file_format, text):
+    """Render a section heading"""
+    return f"<h2>{html.escape(text)}</h2>" if file_format == 'html' else f"## {text}"
+
+
+def _render_report_page(job):
+    """Render one report page to disk; module-level so process pools can pickle it"""
+    path, kind, payload, file_format, layout, doc_file = job
+    root = '' if kind == 'index' else '../'
+    link = lambda href, text: _report_link(file_format, root + href, text)
+
+    if kind == 'index':
+        title = 'Feature Report'
+        body = '\n\n'.join([
+            _report_heading(file_format, 'Status Boards'),
+            _report_table(file_format, ['Status', 'Features'],
+                          [[link(f"status/{status}", status.title()), count]
+                           for status, count in payload['statuses']]),
+            _report_heading(file_format, 'Epics'),
+            _report_table(file_format, ['Epic', 'Name', 'Complete'],
+                          [[link(f"epics/{epic_id}", epic_id), name, f"{percent}%"]
+                           for epic_id, name, percent in payload['epics']])
+        ])
+    elif kind == 'status':
+        title = f"{payload['status'].title()} Board"
+        body = _report_table(file_format, ['Feature', 'Name', 'Priority', 'Hours', 'Epic'],
+                             [[link(f"features/{feature_id}", feature_id), name, priority, hours,
+                               link(f"epics/{epic}", epic) if epic else None]
+                              for feature_id, name, priority, hours, epic in payload['features']])
+    elif kind == 'epic':
+        epic = payload['epic']
+        rollup = epic.get('rollup') or {}
+        title = f"{epic['id']} - {epic['name']}"
+        body = '\n\n'.join([
+            _report_table(file_format, ['Field', 'Value'], [
+                ['Description', epic.get('description')],
+                ['Status', rollup.get('status', epic.get('status'))],
+                ['Owner', epic.get('owner')],
+                ['Target date', epic.get('targetDate')],
+                ['Projected finish', payload.get('projectedFinish')],
+                ['Complete', f"{rollup.get('percentComplete', 0)}%"],
+                ['Remaining hours', rollup.get('remainingHours')]
+            ]),
+            _report_heading(file_format, 'Features'),
+            _report_table(file_format, ['Feature', 'Name', 'Status', 'Hours'],
+                          [[link(f"features/{feature_id}", feature_id), name, status, hours]
+                           for feature_id, name, status, hours in payload['members']])
+        ])
+    else:
+        feature = payload['feature']
+        title = f"{feature['id']} - {feature['name']}"
+        epic = feature.get('epic')
+        sections = [
+            _report_table(file_format, ['Field', 'Value'], [
+                ['Description', feature.get('description')],
+                ['Status', feature.get('status', 'complete')],
+                ['Priority', feature.get('priority')],
+                ['Epic', link(f"epics/{epic}", epic) if epic else None],
+                ['Owner', feature.get('owner')],
+                ['Estimated hours', feature.get('estimatedHours')],
+                ['Business value', feature.get('businessValue')],
+                ['Complexity', feature.get('technicalComplexity')],
+                ['Tags', feature.get('tags')],
+                ['Created', feature.get('createdDate')],
+                ['Completed', feature.get('completedDate')],
+                ['Linear issue', feature.get('linearIssue')]
+            ])
+        ]
+        if doc_file:
+            with open(doc_file, 'r', encoding='utf-8') as f:
+                doc = f.read()
+            sections.append(_report_heading(file_format, 'Documentation'))
+            sections.append(f"<pre>{html.escape(doc)}</pre>" if file_format == 'html' else doc)
+        body = '\n\n'.join(sections)
+
+    if file_format == 'html':
+        title = html.escape(title)
+    # One pass, so placeholder-like text inside titles or docs is left alone
+    values = {'title': title, 'root': root, 'body': body}
+    content = REPORT_PLACEHOLDER.sub(lambda match: values[match.group(1)], layout)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def _summarize_repo(root):
+    """Load one repository's backlog into a compact portfolio summary
+
+    Module-level so the portfolio command can run it in a process pool. A backlog
+    that cannot be read yields an {'error': ...} summary instead of raising, so
+    one broken repository does not abort the whole portfolio.
+    """
+    fm = FeatureManager(root)
+    stamp = fm._backlog_stamp()
+    try:
+        data = fm.load_backlog()
+        fm._update_metrics(data)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return {'root': str(root), 'stamp': stamp, 'error': f"{type(e).__name__}: {e}"}
+
+    records = data['backlog']['features'] + data['completed']['features']
+    by_id = {f['id']: f for f in records}
+    epics = []
+    for epic in data['backlog']['epics']:
+        rollup = epic.get('rollup') or fm._compute_rollup(dict(epic), by_id)
+        epics.append({'id': epic['id'], 'name': epic['name'], 'targetDate': epic.get('targetDate'),
+                      'startDate': epic.get('startDate'), 'rollup': rollup})
+
+    features = [{
+        'id': f['id'],
+        'name': f['name'],
+        'description': f.get('description') or '',
+        'status': f.get('status', 'complete'),
+        'priority': f.get('priority'),
+        'epic': f.get('epic'),
+        'owner': f.get('owner'),
+        'estimatedHours': f.get('estimatedHours') or 0,
+        'tags': f.get('tags') or [],
+        'createdDate': f.get('createdDate') or f.get('completedDate') or '-'
+    } for f in records]
+    return {'root': str(root), 'stamp': stamp, 'metrics': data['metrics'], 'epics': epics, 'features': features}
+
+
+def _search_terms(text):
+    """Casefolded word terms used by the search index and queries
+
+    Single ASCII characters are dropped as noise. Non-ASCII words also yield their
+    character bigrams, since scripts such as CJK do not separate words with spaces.
+    """
+    terms = []
+    for word in TERM_PATTERN.findall(text.casefold()):
+        if word.isascii():
+            if len(word) > 1:
+                terms.append(word)
+            continue
+        terms.append(word)
+        if len(word) > 2:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return list(dict.fromkeys(terms))
+
+
+def _positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def _positive_float(value):
+    """argparse type for rates that must be above 0"""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
 
 class FeatureManager:
     def __init__(self, project_root=None):
@@ -19,6 +300,15 @@ class FeatureManager:
         self.data_dir = self.project_root / ".feature-tracking" / "data"
         self.templates_dir = self.features_dir / "templates"
         self.backlog_file = self.data_dir / "backlog.json"
+        self.cache_dir = self.data_dir / "cache"
+        self.index_file = self.cache_dir / "index.json"
+        self.index_hint_file = self.cache_dir / "index-hint.json"
+        self.events_dir = self.data_dir / "events"
+        self.minhash_file = self.cache_dir / "minhash.sqlite"
+        self.ranking_config_file = self.data_dir / "ranking.json"
+        self.priority_queue_file = self.cache_dir / "priority-queue.json"
+        self.portfolio_cache_file = self.cache_dir / "portfolio.json"
+        self.branch_cache_file = self.cache_dir / "branch-status.json"
 
     def load_backlog(self):
         """Load backlog data from JSON file"""
@@ -28,14 +318,55 @@ class FeatureManager:
         except FileNotFoundError:
             return self._create_empty_backlog()
 
-    def save_backlog(self, data):
-        """Save backlog data to JSON file"""
+    def save_backlog(self, data, changed=None):
+        """Save backlog data to JSON file
+
+        changed lists the ids of the only features this save modified, so the next
+        sync_index can re-hash just those instead of every feature.
+        """
         data['lastUpdated'] = datetime.now().strftime('%Y-%m-%d')
         self._update_metrics(data)
 
+        before = self._file_stamp(self.backlog_file)
+        self._write_backlog_file(data)
+        if changed is not None:
+            self._record_index_hint(before, changed)
+
+    def _file_stamp(self, path):
+        """[mtime_ns, size] of a file as stored in the index, or None if missing"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _load_index_hint(self):
+        """Saves since the index last absorbed the backlog: base and latest stamp, touched ids"""
+        try:
+            with open(self.index_hint_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _record_index_hint(self, before, changed):
+        """Extend the chain of hinted saves, or start a new one if another save broke it"""
+        hint = self._load_index_hint()
+        if hint and hint['stamp'] == before:
+            hint['features'] = sorted(set(hint['features']) | set(changed))
+        else:
+            hint = {'base': before, 'features': sorted(set(changed))}
+        hint['stamp'] = self._file_stamp(self.backlog_file)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.index_hint_file, 'w', encoding='utf-8') as f:
+            json.dump(hint, f)
+
+    def _write_backlog_file(self, data):
+        """Atomically replace backlog.json so readers never see a partial file"""
         os.makedirs(self.data_dir, exist_ok=True)
-        with open(self.backlog_file, 'w', encoding='utf-8') as f:
+        tmp_file = self.backlog_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.backlog_file)
 
     def _create_empty_backlog(self):
         """Create empty backlog structure"""
@@ -44,9 +375,15 @@ class FeatureManager:
             "lastUpdated": datetime.now().strftime('%Y-%m-%d'),
             "backlog": {"epics": [], "features": []},
             "completed": {"features": []},
+            "dependencies": {"order": [], "dependents": {}},
             "metrics": {}
         }
 
+    def _slugify(self, name):
+        """Convert a feature name into the slug used for docs and branches"""
+        safe_name = re.sub(r'[^\w\s-]', '', name).strip()
+        return re.sub(r'[-\s]+', '-', safe_name).lower()
+
     def _update_metrics(self, data):
         """Update backlog metrics"""
         backlog_features = len(data['backlog']['features'])
@@ -61,12 +398,106 @@ class FeatureManager:
             "completedHours": 0  # TODO: Track actual hours
         }
 
+    def _find_epic(self, data, epic_id):
+        """Return the epic record with the given id, if any"""
+        for epic in data['backlog']['epics']:
+            if epic['id'] == epic_id:
+                return epic
+        return None
+
+    def _empty_rollup(self):
+        """Create empty epic rollup structure"""
+        return {
+            "featureCounts": {status: 0 for status in STATUSES},
+            "estimatedHours": 0,
+            "completedHours": 0,
+            "since": None
+        }
+
+    def _finish_rollup(self, epic):
+        """Derive progress and status from the rollup counters"""
+        rollup = epic['rollup']
+        counts = rollup['featureCounts']
+        total = sum(counts.values())
+        remaining = rollup['estimatedHours'] - rollup['completedHours']
+
+        rollup['remainingHours'] = remaining
+        rollup['percentComplete'] = (round(rollup['completedHours'] / rollup['estimatedHours'] * 100, 1)
+                                     if rollup['estimatedHours'] else 0.0)
+        if total and counts['complete'] == total:
+            rollup['status'] = 'complete'
+        elif total and counts['backlog'] + counts['planning'] < total:
+            rollup['status'] = 'active'
+        else:
+            rollup['status'] = 'planning'
+
+    def _projected_finish(self, epic):
+        """Project an epic's finish date from its average completed hours per day so far
+
+        Computed on read rather than stored in the rollup, since it moves with today's date.
+        """
+        rollup = epic.get('rollup') or {}
+        started = epic.get('startDate') or rollup.get('since')
+        remaining = rollup.get('remainingHours') or 0
+        if not started or remaining <= 0 or not rollup.get('completedHours'):
+            return None
+        elapsed = max((date.today() - datetime.strptime(started, '%Y-%m-%d').date()).days, 1)
+        days_left = remaining / (rollup['completedHours'] / elapsed)
+        return (date.today() + timedelta(days=round(days_left))).isoformat()
+
+    def _compute_rollup(self, epic, records):
+        """Recompute an epic's rollup from its membership list"""
+        epic['rollup'] = self._empty_rollup()
+        for feature_id in epic.get('features', []):
+            feature = records.get(feature_id)
+            if feature:
+                self._add_to_rollup(epic['rollup'], feature, feature.get('status', 'complete'), 1)
+        self._finish_rollup(epic)
+        return epic['rollup']
+
+    def _add_to_rollup(self, rollup, feature, status, sign):
+        """Add (sign=1) or remove (sign=-1) one feature's share of a rollup"""
+        hours = feature.get('estimatedHours') or 0
+        rollup['featureCounts'][status] = rollup['featureCounts'].get(status, 0) + sign
+        rollup['estimatedHours'] += sign * hours
+        if status == 'complete':
+            rollup['completedHours'] += sign * hours
+        created = feature.get('createdDate')
+        if sign > 0 and created and (rollup['since'] is None or created < rollup['since']):
+            rollup['since'] = created
+
+    def _update_epic_rollup(self, data, feature, old_status, new_status):
+        """Incrementally apply one feature's create/move to its epic's rollup"""
+        epic = self._find_epic(data, feature.get('epic'))
+        if not epic:
+            return
+
+        if feature['id'] not in epic.setdefault('features', []):
+            epic['features'].append(feature['id'])
+            old_status = None
+        if 'rollup' not in epic:
+            records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+            self._compute_rollup(epic, records)
+            return
+
+        if old_status:
+            self._add_to_rollup(epic['rollup'], feature, old_status, -1)
+        self._add_to_rollup(epic['rollup'], feature, new_status, 1)
+        self._finish_rollup(epic)
+
     def create_feature(self, name, description, priority="medium", epic=None,
-                      estimated_hours=8, tags=None, business_value="medium", linear_issue=None):
+                      estimated_hours=8, tags=None, business_value="medium", linear_issue=None,
+                      depends_on=None):
         """Create a new feature and add to backlog"""
 
         # Generate feature ID
         data = self.load_backlog()
+        known_ids = {f['id'] for f in data['backlog']['features'] + data['completed']['features']}
+        unknown = [feature_id for feature_id in depends_on or [] if feature_id not in known_ids]
+        if unknown:
+            print(f"❌ Unknown dependencies: {', '.join(unknown)}")
+            return None
+
         feature_count = len(data['backlog']['features']) + len(data['completed']['features'])
         feature_id = f"feat-{feature_count + 1:03d}"
 
@@ -84,12 +515,26 @@ class FeatureManager:
             "businessValue": business_value,
             "technicalComplexity": "medium",  # Default
             "createdDate": datetime.now().strftime('%Y-%m-%d'),
-            "linearIssue": linear_issue  # Linear integration
+            "linearIssue": linear_issue,  # Linear integration
+            "dependsOn": list(depends_on or [])
         }
 
+        # Warn about likely duplicates before filing
+        conn = self._minhash_db(data)
+        self._warn_duplicates(self.find_duplicates(name, description, conn=conn), data)
+
         # Add to backlog
+        self._ensure_event_log(data)
+        dependency_index = self._dependency_index(data)
         data['backlog']['features'].append(feature)
-        self.save_backlog(data)
+        self._update_epic_rollup(data, feature, None, 'backlog')
+        self._index_new_dependencies(dependency_index, feature)
+        ranking = self._load_ranking(data)
+        self.save_backlog(data, [feature['id']])
+        self._record_event(feature_id, None, 'backlog')
+        self._index_minhash(conn, feature)
+        conn.close()
+        self._update_ranking(ranking, feature)
 
         # Create feature documentation
         self._create_feature_doc(feature)
@@ -120,8 +565,7 @@ class FeatureManager:
         doc = doc.replace('[Date]', feature['createdDate'])
 
         # Create feature document
-        safe_name = re.sub(r'[^\w\s-]', '', feature['name']).strip()
-        safe_name = re.sub(r'[-\s]+', '-', safe_name).lower()
+        safe_name = self._slugify(feature['name'])
 
         feature_dir = self.features_dir / feature['status']
         os.makedirs(feature_dir, exist_ok=True)
@@ -134,8 +578,7 @@ class FeatureManager:
 
     def _suggest_branch_creation(self, feature):
         """Suggest git branch creation commands"""
-        safe_name = re.sub(r'[^\w\s-]', '', feature['name']).strip()
-        safe_name = re.sub(r'[-\s]+', '-', safe_name).lower()
+        safe_name = self._slugify(feature['name'])
 
         linear_branch = f"feature/{feature.get('linearIssue', feature['id'])}-{safe_name}"
         standard_branch = f"feature/{feature['id']}-{safe_name}"
@@ -151,6 +594,8 @@ class FeatureManager:
         """Move feature to different status"""
         data = self.load_backlog()
 
+        self._ensure_event_log(data)
+
         # Find feature in backlog
         feature = None
         for i, f in enumerate(data['backlog']['features']):
@@ -173,7 +618,11 @@ class FeatureManager:
         else:
             data['backlog']['features'].append(feature)
 
-        self.save_backlog(data)
+        self._update_epic_rollup(data, feature, old_status, new_status)
+        ranking = self._load_ranking(data)
+        self.save_backlog(data, [feature_id])
+        self._record_event(feature_id, old_status, new_status)
+        self._update_ranking(ranking, feature)
 
         # Move documentation file
         self._move_feature_doc(feature, old_status, new_status)
@@ -183,10 +632,14 @@ class FeatureManager:
 
     def _move_feature_doc(self, feature, old_status, new_status):
         """Move feature documentation to appropriate directory"""
-        safe_name = re.sub(r'[^\w\s-]', '', feature['name']).strip()
-        safe_name = re.sub(r'[-\s]+', '-', safe_name).lower()
+        safe_name = self._slugify(feature['name'])
 
         old_path = self.features_dir / old_status / f"{feature['id']}-{safe_name}.md"
+        if not old_path.exists():
+            # Docs are relocated on each move (and may keep an older slug), so look them up by id
+            candidates = sorted(glob.glob(str(self.features_dir / '*' / f"{feature['id']}-*.md")))
+            if candidates:
+                old_path = Path(candidates[0])
 
         if new_status == 'complete':
             new_dir = self.features_dir / "completed"
@@ -200,7 +653,7 @@ class FeatureManager:
             old_path.rename(new_path)
             print(f"📄 Moved documentation: {new_path}")
 
-    def list_features(self, status=None):
+    def list_features(self, status=None, branches=False, base=None):
         """List features, optionally filtered by status"""
         data = self.load_backlog()
 
@@ -208,6 +661,10 @@ class FeatureManager:
         if status:
             features = [f for f in features if f['status'] == status]
 
+        self._print_features(features, self.branch_status(features, base) if branches else None)
+
+    def _print_features(self, features, branches=None):
+        """Print feature summaries in the standard list layout"""
         if not features:
             print("No features found")
             return
@@ -223,24 +680,1323 @@ class FeatureManager:
                 'review': '👀',
                 'testing': '🧪',
                 'complete': '✅'
-            }.get(feature['status'], '❓')
+            }.get(feature.get('status', 'complete'), '❓')
 
             priority_emoji = {
                 'critical': '🔥',
                 'high': '⚡',
                 'medium': '➡️',
                 'low': '⬇️'
-            }.get(feature['priority'], '❓')
+            }.get(feature.get('priority'), '❓')
 
             print(f"{status_emoji} {feature['id']} - {feature['name']}")
-            print(f"   {priority_emoji} {feature['priority'].title()} | "
-                  f"📅 {feature['createdDate']} | "
-                  f"⏱️  {feature['estimatedHours']}h")
+            print(f"   {priority_emoji} {(feature.get('priority') or 'unset').title()} | "
+                  f"📅 {feature.get('createdDate', feature.get('completedDate', '-'))} | "
+                  f"⏱️  {feature.get('estimatedHours', 0)}h")
             print(f"   📖 {feature['description']}")
             if feature.get('linearIssue'):
                 print(f"   🔗 Linear: {feature['linearIssue']}")
+            if branches is not None:
+                for branch in branches.get(feature['id'], []) or [None]:
+                    print(f"   🌿 {self._format_branch(branch)}")
+            print()
+
+    def show_query(self, text=None, status=None, epic=None, priority=None, tag=None,
+                   branches=False, base=None):
+        """Print features matching a text search and filters"""
+        features = self.query_features(text, status, epic, priority, tag)
+        self._print_features(features, self.branch_status(features, base) if branches else None)
+
+    def query_features(self, text=None, status=None, epic=None, priority=None, tag=None):
+        """Return backlog and completed features matching a text search and filters"""
+        data = self.load_backlog()
+        features = data['backlog']['features'] + data['completed']['features']
+
+        if text:
+            index = self.sync_index()
+            matched = None
+            for term in _search_terms(text):
+                hits = set(index['postings'].get(term, []))
+                matched = hits if matched is None else matched & hits
+            # A query with no usable terms matches nothing rather than everything
+            features = [f for f in features if f['id'] in (matched or set())]
+
+        if status:
+            features = [f for f in features if f.get('status', 'complete') == status]
+        if epic:
+            features = [f for f in features if f.get('epic') == epic]
+        if priority:
+            features = [f for f in features if f.get('priority') == priority]
+        if tag:
+            features = [f for f in features if tag in (f.get('tags') or [])]
+
+        return features
+
+    def check_epics(self, data):
+        """Return consistency problems between epics, members and rollups"""
+        records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+        epic_ids = {epic['id'] for epic in data['backlog']['epics']}
+        problems = []
+
+        for epic in data['backlog']['epics']:
+            for feature_id in epic.get('features', []):
+                if feature_id not in records:
+                    problems.append(f"{epic['id']} lists unknown feature {feature_id}")
+                elif records[feature_id].get('epic') not in (None, epic['id']):
+                    problems.append(f"{epic['id']} lists {feature_id}, "
+                                    f"which belongs to {records[feature_id]['epic']}")
+
+            stored = json.dumps(epic.get('rollup'), sort_keys=True)
+            expected = json.dumps(self._compute_rollup(dict(epic), records), sort_keys=True)
+            if stored != expected:
+                problems.append(f"{epic['id']} rollup is stale")
+
+        for feature in records.values():
+            epic_id = feature.get('epic')
+            if not epic_id:
+                continue
+            if epic_id not in epic_ids:
+                problems.append(f"{feature['id']} references unknown epic {epic_id}")
+            elif feature['id'] not in self._find_epic(data, epic_id).get('features', []):
+                problems.append(f"{feature['id']} is missing from {epic_id} feature list")
+
+        return problems
+
+    def show_epics(self, check=False, rebuild=False):
+        """Display epic rollups, optionally verifying or rebuilding them"""
+        data = self.load_backlog()
+
+        if rebuild:
+            records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+            for epic in data['backlog']['epics']:
+                self._compute_rollup(epic, records)
+            self.save_backlog(data, [])
+            print(f"✅ Rebuilt rollups for {len(data['backlog']['epics'])} epics")
+
+        epics = data['backlog']['epics']
+        if not epics:
+            print("No epics found")
+            return
+
+        print(f"\n🗂️  Epics ({len(epics)} total):")
+        print("-" * 80)
+        for epic in epics:
+            rollup = epic.get('rollup')
+            print(f"{epic['id']} - {epic['name']}")
+            if not rollup:
+                print("   ⚠️  No rollup yet (run: epics --rebuild)")
+                print()
+                continue
+
+            counts = ', '.join(f"{status} {count}" for status, count in rollup['featureCounts'].items() if count)
+            filled = int(rollup['percentComplete'] // 5)
+            print(f"   {rollup['status'].title()} | {counts or 'no features'}")
+            print(f"   [{'█' * filled}{'░' * (20 - filled)}] {rollup['percentComplete']}% | "
+                  f"⏱️  {rollup['completedHours']}/{rollup['estimatedHours']}h "
+                  f"({rollup['remainingHours']}h remaining)")
+
+            target = epic.get('targetDate')
+            projected = self._projected_finish(epic)
+            late = '⚠️ ' if projected and target and projected > target else ''
+            print(f"   🎯 Target {target or '-'} | {late}Projected {projected or '-'}")
             print()
 
+        if check:
+            problems = self.check_epics(data)
+            if problems:
+                print(f"❌ {len(problems)} consistency problem(s):")
+                for problem in problems:
+                    print(f"   - {problem}")
+            else:
+                print("✅ Epic memberships and rollups are consistent")
+
+    def _iter_events(self, chunk_size, feature_ids=None):
+        """Stream event log rows chunk by chunk without loading whole columns"""
+        ids = self._event_ids()
+        handles = {}
+        try:
+            for name in EVENT_COLUMNS:
+                handles[name] = open(self.events_dir / f"{name}.bin", 'rb')
+        except FileNotFoundError:
+            for handle in handles.values():
+                handle.close()
+            return
+
+        try:
+            while True:
+                columns = {}
+                for name, (typecode, _) in EVENT_COLUMNS.items():
+                    column = array(typecode)
+                    try:
+                        column.fromfile(handles[name], chunk_size)
+                    except EOFError:
+                        pass  # Short final chunk: the available items were still read
+                    if sys.byteorder == 'big':
+                        column.byteswap()
+                    columns[name] = column
+
+                rows = min(len(column) for column in columns.values())
+                if not rows:
+                    break
+                for i in range(rows):
+                    feature_id = ids[columns['feature'][i]]
+                    if feature_ids is not None and feature_id not in feature_ids:
+                        continue
+                    old_code, new_code = columns['from'][i], columns['to'][i]
+                    yield {
+                        'timestamp': datetime.fromtimestamp(columns['ts'][i], timezone.utc).isoformat(),
+                        'featureId': feature_id,
+                        'fromStatus': STATUSES[old_code] if old_code >= 0 else None,
+                        'toStatus': STATUSES[new_code] if new_code >= 0 else None
+                    }
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def _iter_export_rows(self, entity, chunk_size, filters):
+        """Yield export rows for features, epics or events"""
+        if entity == 'events':
+            feature_ids = None
+            if any(filters.values()):
+                feature_ids = {f['id'] for f in self.query_features(**filters)}
+            yield from self._iter_events(chunk_size, feature_ids)
+            return
+
+        data = self.load_backlog()
+        if entity == 'epics':
+            for epic in data['backlog']['epics']:
+                if filters.get('epic') and epic['id'] != filters['epic']:
+                    continue
+                if filters.get('priority') and epic.get('priority') != filters['priority']:
+                    continue
+                if filters.get('status') and epic.get('status') != filters['status']:
+                    continue
+                rollup = epic.get('rollup') or {}
+                yield dict(epic, percentComplete=rollup.get('percentComplete'),
+                           remainingHours=rollup.get('remainingHours'),
+                           projectedFinish=self._projected_finish(epic))
+            return
+
+        for feature in self.query_features(**filters):
+            row = dict(feature)
+            row.setdefault('status', 'complete')
+            yield row
+
+    def _write_columnar(self, file_format, output, fields, chunks):
+        """Write row chunks as Parquet, Arrow IPC or NumPy .npz; return the row count"""
+        if file_format == 'npz':
+            if np is None:
+                print("❌ .npz export requires NumPy (pip install numpy)")
+                return None
+            columns = {field: [] for field in fields}
+            for chunk in chunks:
+                for row in chunk:
+                    for field in fields:
+                        columns[field].append(row.get(field))
+            arrays = {}
+            for field, values in columns.items():
+                if field in NUMERIC_FIELDS:
+                    arrays[field] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+                else:
+                    arrays[field] = np.array(['' if v is None else ';'.join(v) if isinstance(v, list) else str(v)
+                                              for v in values], dtype=str)
+            np.savez_compressed(output, **arrays)
+            return len(columns[fields[0]]) if fields else 0
+
+        try:
+            import pyarrow as pa
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:
+            print(f"❌ {file_format} export requires pyarrow (pip install pyarrow); try --format npz")
+            return None
+
+        schema = pa.schema([
+            (field, pa.float64() if field in NUMERIC_FIELDS
+             else pa.list_(pa.string()) if field in LIST_FIELDS else pa.string())
+            for field in fields
+        ])
+        if file_format == 'parquet':
+            writer = pyarrow.parquet.ParquetWriter(output, schema)
+        else:
+            writer = pyarrow.ipc.new_file(output, schema)
+
+        count = 0
+        with writer:
+            for chunk in chunks:
+                batch = {field: [] for field in fields}
+                for row in chunk:
+                    for field in fields:
+                        value = row.get(field)
+                        if value is not None and field not in NUMERIC_FIELDS and field not in LIST_FIELDS:
+                            value = str(value)
+                        batch[field].append(value)
+                table = pa.Table.from_pydict(batch, schema=schema)
+                if file_format == 'parquet':
+                    writer.write_table(table)
+                else:
+                    writer.write(table)
+                count += len(chunk)
+        return count
+
+    def export(self, file_format='csv', entity='features', fields=None, output=None,
+               chunk_size=10000, **filters):
+        """Stream features, epics or events to CSV, JSONL or a columnar file"""
+        fields = fields or EXPORT_FIELDS[entity]
+        unknown = [field for field in fields if field not in EXPORT_FIELDS[entity]]
+        if unknown:
+            print(f"❌ Unknown {entity} fields: {', '.join(unknown)} "
+                  f"(available: {', '.join(EXPORT_FIELDS[entity])})")
+            return False
+        if file_format == 'columnar':
+            try:
+                import pyarrow  # noqa: F401
+                file_format = 'parquet'
+            except ImportError:
+                file_format = 'npz'
+
+        if file_format not in ('csv', 'jsonl') and not output:
+            print(f"❌ --output is required for {file_format} export")
+            return False
+        if file_format == 'npz' and Path(output).suffix != '.npz':
+            # np.savez_compressed appends .npz anyway; name the file it really writes
+            output = str(Path(output).with_suffix('.npz'))
+            print(f"⚠️  Writing NumPy archive to {output}")
+        if entity == 'epics':
+            unsupported = [name for name in ('text', 'tag') if filters.get(name)]
+            if unsupported:
+                print(f"❌ --{'/--'.join(unsupported)} cannot filter epics; use --epic, --status or --priority")
+                return False
+
+        rows = self._iter_export_rows(entity, chunk_size, filters)
+        chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+
+        if file_format in ('csv', 'jsonl'):
+            handle = open(output, 'w', encoding='utf-8', newline='') if output else sys.stdout
+            count = 0
+            try:
+                if file_format == 'csv':
+                    writer = csv.writer(handle)
+                    writer.writerow(fields)
+                for chunk in chunks:
+                    if file_format == 'csv':
+                        writer.writerows([';'.join(value) if isinstance(value, list) else value
+                                          for value in map(row.get, fields)] for row in chunk)
+                    else:
+                        handle.writelines(json.dumps({field: row.get(field) for field in fields},
+                                                     ensure_ascii=False) + '\n' for row in chunk)
+                    count += len(chunk)
+            finally:
+                if output:
+                    handle.close()
+        else:
+            count = self._write_columnar(file_format, output, fields, chunks)
+            if count is None:
+                return False
+
+        if output:
+            print(f"✅ Exported {count} {entity} to {output} ({file_format})")
+        return True
+
+    def _report_pages(self, data, index):
+        """Yield every report page as (name, kind, input key, doc path, payload builder)
+
+        Keys are built from the indexed feature and doc hashes, so unchanged pages
+        are skipped without assembling or encoding their payloads. Pages are
+        yielded one at a time rather than collected, so a 50k-feature build does
+        not hold a tuple and closure for every page at once.
+        """
+        records = data['backlog']['features'] + data['completed']['features']
+        indexed = index['features']
+
+        by_status = {status: [] for status in STATUSES}
+        for feature in records:
+            by_status.setdefault(feature.get('status', 'complete'), []).append(feature)
+            doc_path = index['docPaths'].get(feature['id'])
+            yield (f"features/{feature['id']}", 'feature', f"{indexed[feature['id']]['hash']}:{index['docs'].get(doc_path)}",
+                   doc_path, lambda feature=feature: {'feature': feature})
+
+        for status, features in by_status.items():
+            key = ':'.join([status] + [indexed[f['id']]['hash'] for f in features])
+            yield (f"status/{status}", 'status', key, None,
+                   lambda status=status, features=features: self._status_payload(status, features))
+
+        members = {f['id']: f for f in records}
+        for epic in data['backlog']['epics']:
+            projected = self._projected_finish(epic)
+            member_ids = [feature_id for feature_id in epic.get('features', []) if feature_id in members]
+            key = ':'.join([json.dumps([epic, projected], sort_keys=True, ensure_ascii=False)]
+                           + [indexed[feature_id]['hash'] for feature_id in member_ids])
+            yield (f"epics/{epic['id']}", 'epic', key, None,
+                   lambda epic=epic, projected=projected, member_ids=member_ids: {
+                       'epic': epic, 'projectedFinish': projected,
+                       'members': [[feature_id, members[feature_id]['name'],
+                                    members[feature_id].get('status', 'complete'),
+                                    members[feature_id].get('estimatedHours')]
+                                   for feature_id in member_ids]
+                   })
+
+        overview = {
+            'statuses': [[status, len(features)] for status, features in by_status.items()],
+            'epics': [[epic['id'], epic['name'], (epic.get('rollup') or {}).get('percentComplete', 0)]
+                      for epic in data['backlog']['epics']]
+        }
+        yield ('index', 'index', json.dumps(overview, sort_keys=True, ensure_ascii=False), None, lambda: overview)
+
+    def _status_payload(self, status, features):
+        """Rows of one status board"""
+        return {'status': status, 'features': [[f['id'], f['name'], f.get('priority'), f.get('estimatedHours'),
+                                                f.get('epic')] for f in features]}
+
+    def generate_report(self, file_format='html', output=None, jobs=None, force=False):
+        """Render the static feature report, re-rendering only pages whose inputs changed"""
+        started = time.monotonic()
+        output_dir = Path(output) if output else self.project_root / ".feature-tracking" / "reports"
+        extension = 'html' if file_format == 'html' else 'md'
+        rendered, total = self._build_report(file_format, output_dir, jobs, force)
+
+        elapsed = time.monotonic() - started
+        print(f"✅ Rendered {rendered} of {total} pages ({total - rendered} unchanged) in {elapsed:.2f}s")
+        print(f"📄 Report: {output_dir / f'index.{extension}'}")
+        return True
+
+    def _build_report(self, file_format, output_dir, jobs, force):
+        """Render changed report pages and prune stale ones; return (rendered, total) page counts"""
+        extension = 'html' if file_format == 'html' else 'md'
+        manifest_file = output_dir / ".manifest.json"
+
+        layout_file = self.templates_dir / f"report-page.{extension}"
+        layout = layout_file.read_text(encoding='utf-8') if layout_file.exists() else REPORT_LAYOUTS[file_format]
+        layout_hash = hashlib.sha1(f"{REPORT_VERSION}:{file_format}:{layout}".encode('utf-8')).hexdigest()
+
+        # --force re-renders everything, but the old manifest still says which pages to delete
+        manifest = {}
+        if manifest_file.exists():
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        previous = {} if force else manifest
+
+        data = self.load_backlog()
+        index = self.sync_index()
+        hashes = {}
+        jobs_to_run = []
+        for name, kind, key, doc_path, build in self._report_pages(data, index):
+            rel_path = f"{name}.{extension}"
+            digest = hashlib.sha1(f"{layout_hash}:{kind}:{key}".encode('utf-8')).hexdigest()
+            hashes[rel_path] = digest
+            if previous.get(rel_path) != digest:
+                doc_file = os.path.join(self.project_root, doc_path) if doc_path else None
+                jobs_to_run.append((os.path.join(output_dir, rel_path), kind, build(),
+                                    file_format, layout, doc_file))
+
+        workers = jobs or os.cpu_count() or 1
+        if workers > 1 and len(jobs_to_run) >= REPORT_POOL_MIN_PAGES:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunk = max(1, len(jobs_to_run) // (workers * 8))
+                for _ in pool.map(_render_report_page, jobs_to_run, chunksize=chunk):
+                    pass
+        else:
+            for job in jobs_to_run:
+                _render_report_page(job)
+
+        for rel_path in set(manifest) - set(hashes):
+            stale_page = output_dir / rel_path
+            if stale_page.exists():
+                stale_page.unlink()
+
+        os.makedirs(output_dir, exist_ok=True)
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(hashes, separators=(',', ':')))
+        return len(jobs_to_run), len(hashes)
+
+    def _backlog_stamp(self):
+        """Cheap change marker for the backlog file"""
+        try:
+            stat = os.stat(self.backlog_file)
+        except FileNotFoundError:
+            return ''
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _minhash_signature(self, name, description):
+        """MinHash signature over the word unigrams and bigrams of a name and description
+
+        Non-ASCII words also contribute character bigrams, so unspaced scripts such
+        as CJK are compared by content. Text without any words gets an empty
+        signature, which never matches anything.
+        """
+        words = TERM_PATTERN.findall(f"{name} {description}".casefold())
+        shingles = set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+        for word in words:
+            if not word.isascii():
+                shingles.update(word[i:i + 2] for i in range(len(word) - 1))
+        if not shingles:
+            return []
+
+        hashed = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+                  for shingle in shingles]
+        if np is not None:
+            values = np.array(hashed, dtype=np.uint64)
+            return ((_MINHASH_A * values + _MINHASH_B) % np.uint64(MINHASH_PRIME)).min(axis=1).tolist()
+        return [min((a * value + b) % MINHASH_PRIME for value in hashed) for a, b in MINHASH_COEFFICIENTS]
+
+    def _band_keys(self, signature):
+        """Signed 64-bit LSH bucket key for each band of a signature"""
+        rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+        keys = []
+        if not signature:
+            return keys
+        for band in range(MINHASH_BANDS):
+            encoded = f"{band}:{signature[band * rows:(band + 1) * rows]}".encode('ascii')
+            keys.append(int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), 'little', signed=True))
+        return keys
+
+    def _pack_signature(self, signature):
+        """Serialize a signature as little-endian uint64s"""
+        packed = array('Q', signature)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return packed.tobytes()
+
+    def _unpack_signature(self, blob):
+        """Deserialize a signature packed by _pack_signature"""
+        signature = array('Q')
+        signature.frombytes(blob)
+        if sys.byteorder == 'big':
+            signature.byteswap()
+        return signature
+
+    def _minhash_db(self, data=None):
+        """Open the MinHash/LSH index, re-syncing it if the backlog changed since last use"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        conn = sqlite3.connect(self.minhash_file)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS signatures (feature_id TEXT PRIMARY KEY, content_hash TEXT, signature BLOB);
+            CREATE TABLE IF NOT EXISTS buckets (band_key INTEGER, feature_id TEXT);
+            CREATE INDEX IF NOT EXISTS buckets_by_key ON buckets (band_key);
+            CREATE INDEX IF NOT EXISTS buckets_by_feature ON buckets (feature_id);
+        """)
+
+        stamp = self._backlog_stamp()
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        outdated = meta.get('version') != str(MINHASH_VERSION)
+        if outdated or meta.get('stamp') != stamp:
+            with conn:
+                if outdated:
+                    conn.execute("DELETE FROM signatures")
+                    conn.execute("DELETE FROM buckets")
+                self._sync_minhash(conn, data or self.load_backlog())
+                conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                 [('version', str(MINHASH_VERSION)), ('stamp', stamp)])
+        return conn
+
+    def _minhash_content_hash(self, feature):
+        """Hash of the fields that feed a feature's signature"""
+        text = f"{feature.get('name') or ''}\n{feature.get('description') or ''}"
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _store_signature(self, conn, feature, content_hash):
+        """Insert or replace one feature's signature and bucket entries"""
+        signature = self._minhash_signature(feature.get('name') or '', feature.get('description') or '')
+        conn.execute("DELETE FROM buckets WHERE feature_id = ?", (feature['id'],))
+        conn.execute("INSERT OR REPLACE INTO signatures VALUES (?, ?, ?)",
+                     (feature['id'], content_hash, self._pack_signature(signature)))
+        conn.executemany("INSERT INTO buckets VALUES (?, ?)",
+                         [(key, feature['id']) for key in self._band_keys(signature)])
+
+    def _sync_minhash(self, conn, data):
+        """Re-sign only the features whose name or description changed"""
+        stored = dict(conn.execute("SELECT feature_id, content_hash FROM signatures"))
+        current = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+
+        removed = [(feature_id,) for feature_id in stored if feature_id not in current]
+        conn.executemany("DELETE FROM signatures WHERE feature_id = ?", removed)
+        conn.executemany("DELETE FROM buckets WHERE feature_id = ?", removed)
+
+        for feature_id, feature in current.items():
+            content_hash = self._minhash_content_hash(feature)
+            if stored.get(feature_id) != content_hash:
+                self._store_signature(conn, feature, content_hash)
+
+    def _index_minhash(self, conn, feature):
+        """Add a newly created feature to an open LSH index without a full re-sync
+
+        The signature and the new backlog stamp are committed together, so the
+        next open sees an index that already matches the saved backlog.
+        """
+        with conn:
+            self._store_signature(conn, feature, self._minhash_content_hash(feature))
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('stamp', ?)", (self._backlog_stamp(),))
+
+    def _similarity(self, left, right):
+        """Estimated Jaccard similarity of two MinHash signatures; 0 if either is empty"""
+        if not len(left) or not len(right):
+            return 0.0
+        return sum(1 for a, b in zip(left, right) if a == b) / MINHASH_PERMUTATIONS
+
+    def find_duplicates(self, name, description, threshold=DUPLICATE_THRESHOLD, conn=None):
+        """Return (similarity, feature id) pairs likely to duplicate the given text"""
+        own_conn = conn is None
+        conn = conn or self._minhash_db()
+        signature = self._minhash_signature(name, description)
+        keys = self._band_keys(signature)
+        if not keys:
+            if own_conn:
+                conn.close()
+            return []
+
+        rows = conn.execute(
+            "SELECT s.feature_id, s.signature FROM signatures s WHERE s.feature_id IN "
+            f"(SELECT feature_id FROM buckets WHERE band_key IN ({','.join('?' * len(keys))}))",
+            keys
+        ).fetchall()
+        if own_conn:
+            conn.close()
+
+        matches = [(self._similarity(signature, self._unpack_signature(blob)), feature_id)
+                   for feature_id, blob in rows]
+        return sorted((match for match in matches if match[0] >= threshold), reverse=True)
+
+    def _warn_duplicates(self, matches, data):
+        """Print likely duplicates of a feature being created"""
+        if not matches:
+            return
+        names = {f['id']: f['name'] for f in data['backlog']['features'] + data['completed']['features']}
+        print("⚠️  Possible duplicates of this feature:")
+        for similarity, feature_id in matches[:5]:
+            print(f"   {feature_id} - {names.get(feature_id, '?')} ({similarity:.0%} similar)")
+
+    def find_duplicate_clusters(self, threshold=DUPLICATE_THRESHOLD):
+        """Group existing features into clusters of likely duplicates"""
+        with self._minhash_db() as conn:
+            signatures = {feature_id: self._unpack_signature(blob)
+                          for feature_id, blob in conn.execute("SELECT feature_id, signature FROM signatures")}
+            buckets = conn.execute(
+                "SELECT group_concat(feature_id, ' ') FROM buckets GROUP BY band_key HAVING COUNT(*) > 1"
+            ).fetchall()
+        conn.close()
+
+        parent = {}
+
+        def find(feature_id):
+            parent.setdefault(feature_id, feature_id)
+            while parent[feature_id] != feature_id:
+                parent[feature_id] = parent[parent[feature_id]]
+                feature_id = parent[feature_id]
+            return feature_id
+
+        checked = set()
+        for (members,) in buckets:
+            members = sorted(members.split(' '))
+            for i, left in enumerate(members):
+                for right in members[i + 1:]:
+                    if (left, right) in checked:
+                        continue
+                    checked.add((left, right))
+                    if self._similarity(signatures[left], signatures[right]) >= threshold:
+                        parent[find(right)] = find(left)
+
+        clusters = {}
+        for feature_id in parent:
+            clusters.setdefault(find(feature_id), []).append(feature_id)
+        return sorted((sorted(members) for members in clusters.values() if len(members) > 1),
+                      key=lambda members: (-len(members), members[0]))
+
+    def show_duplicates(self, threshold=DUPLICATE_THRESHOLD):
+        """Display clusters of likely duplicate features"""
+        data = self.load_backlog()
+        records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+        clusters = self.find_duplicate_clusters(threshold)
+
+        if not clusters:
+            print("✅ No likely duplicates found")
+            return
+
+        print(f"\n🔁 Likely duplicates ({len(clusters)} clusters):")
+        print("-" * 80)
+        for members in clusters:
+            for feature_id in members:
+                feature = records.get(feature_id, {})
+                print(f"   {feature_id} - {feature.get('name', '?')} [{feature.get('status', 'complete')}]")
+            print()
+
+    def _ranking_weights(self):
+        """WSJF weights, with overrides from data/ranking.json"""
+        weights = dict(RANKING_WEIGHTS)
+        if self.ranking_config_file.exists():
+            with open(self.ranking_config_file, 'r', encoding='utf-8') as f:
+                weights.update(json.load(f).get('weights', {}))
+        return weights
+
+    def _ranking_inputs(self, feature):
+        """Key over every field that affects a feature's score or eligibility"""
+        return '|'.join(str(feature.get(field)) for field in (
+            'priority', 'businessValue', 'technicalComplexity', 'estimatedHours',
+            'createdDate', 'status', 'owner', 'epic'))
+
+    def _wsjf_score(self, feature, weights):
+        """Weighted shortest job first: cost of delay divided by job size"""
+        created = feature.get('createdDate')
+        age_days = (date.today() - date.fromisoformat(created)).days if created else 0
+        cost_of_delay = (weights['priority'] * PRIORITY_LEVELS.get(feature.get('priority'), 2)
+                         + weights['value'] * VALUE_LEVELS.get(feature.get('businessValue'), 2)
+                         + weights['age'] * max(age_days, 0) / 30)
+        job_size = (max(feature.get('estimatedHours') or 1, 1)
+                    * COMPLEXITY_FACTORS.get(feature.get('technicalComplexity'), 1.0))
+        return round(cost_of_delay / job_size, 6)
+
+    def _set_rank(self, ranking, feature, weights):
+        """Score one feature and push it onto the global and epic heaps"""
+        feature_id = feature['id']
+        eligible = feature.get('status', 'complete') != 'complete' and not feature.get('owner')
+        if not eligible:
+            ranking['scores'].pop(feature_id, None)  # Heap entries become stale and are skipped
+            return
+
+        score = self._wsjf_score(feature, weights)
+        epic = feature.get('epic')
+        ranking['scores'][feature_id] = [score, epic, self._ranking_inputs(feature)]
+        heapq.heappush(ranking['heaps'].setdefault('*', []), [-score, feature_id])
+        if epic:
+            heapq.heappush(ranking['heaps'].setdefault(epic, []), [-score, feature_id])
+
+    def _compact_ranking(self, ranking):
+        """Rebuild heaps once stale entries outnumber live ones"""
+        live = len(ranking['scores'])
+        if len(ranking['heaps'].get('*', [])) <= 2 * live + 32:
+            return
+        heaps = {'*': []}
+        for feature_id, (score, epic, _) in ranking['scores'].items():
+            heaps['*'].append([-score, feature_id])
+            if epic:
+                heaps.setdefault(epic, []).append([-score, feature_id])
+        for heap in heaps.values():
+            heapq.heapify(heap)
+        ranking['heaps'] = heaps
+
+    def _load_ranking(self, data=None, rescore=False):
+        """Load the priority queue, re-scoring only features edited outside create/move
+
+        Scores include age, so the queue records the day it was scored and is
+        re-scored in full on the first load of a new day.
+        """
+        weights = self._ranking_weights()
+        weights_key = json.dumps(weights, sort_keys=True)
+        ranking = None
+        if self.priority_queue_file.exists() and not rescore:
+            with open(self.priority_queue_file, 'r', encoding='utf-8') as f:
+                ranking = json.load(f)
+            if ranking.get('weights') != weights_key:
+                ranking = None
+        if ranking is None:
+            ranking = {"weights": weights_key, "stamp": None, "scores": {}, "heaps": {}}
+
+        today = date.today().isoformat()
+        if ranking.get('scoredOn') != today:
+            ranking.update(scoredOn=today, scores={}, heaps={})
+            rescore = True
+
+        stamp = self._backlog_stamp()
+        if rescore or ranking['stamp'] != stamp:
+            data = data or self.load_backlog()
+            current = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+            for feature_id in [fid for fid in ranking['scores'] if fid not in current]:
+                del ranking['scores'][feature_id]
+            for feature_id, feature in current.items():
+                entry = ranking['scores'].get(feature_id)
+                if rescore or not entry or entry[2] != self._ranking_inputs(feature):
+                    self._set_rank(ranking, feature, weights)
+            ranking['stamp'] = stamp
+            self._compact_ranking(ranking)
+            self._save_ranking(ranking)
+        return ranking
+
+    def _save_ranking(self, ranking):
+        """Atomically write the priority queue"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = self.priority_queue_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(ranking, f, separators=(',', ':'))
+        os.replace(tmp_file, self.priority_queue_file)
+
+    def _update_ranking(self, ranking, feature):
+        """Re-score a feature touched by create/move and stamp the saved backlog"""
+        self._set_rank(ranking, feature, self._ranking_weights())
+        ranking['stamp'] = self._backlog_stamp()
+        self._compact_ranking(ranking)
+        self._save_ranking(ranking)
+
+    def top_features(self, k=5, epic=None, rescore=False):
+        """Return the top-k (score, feature id) pairs without popping the heap
+
+        Walks the heap array best-first, so only O(k) nodes (plus any stale
+        entries) are visited.
+        """
+        ranking = self._load_ranking(rescore=rescore)
+        heap = ranking['heaps'].get(epic or '*', [])
+        scores = ranking['scores']
+
+        results = []
+        seen = set()
+        frontier = [(heap[0][0], heap[0][1], 0)] if heap else []
+        while frontier and len(results) < k:
+            neg_score, feature_id, position = heapq.heappop(frontier)
+            entry = scores.get(feature_id)
+            if (entry and entry[0] == -neg_score and feature_id not in seen
+                    and (epic is None or entry[1] == epic)):
+                seen.add(feature_id)
+                results.append((-neg_score, feature_id))
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+        return results
+
+    def show_next(self, k=5, epic=None, rescore=False):
+        """Display the highest-scoring unassigned features"""
+        top = self.top_features(k, epic, rescore)
+        if not top:
+            print("No unassigned features to pick up")
+            return
+
+        data = self.load_backlog()
+        records = {f['id']: f for f in data['backlog']['features']}
+        print(f"\n🎯 Next up{f' in {epic}' if epic else ''} (WSJF):")
+        print("-" * 80)
+        for rank, (score, feature_id) in enumerate(top, 1):
+            feature = records.get(feature_id, {})
+            print(f"{rank}. {feature_id} - {feature.get('name', '?')}")
+            print(f"   Score {score:.3f} | {feature.get('priority', '-')} priority | "
+                  f"{feature.get('businessValue', '-')} value | ⏱️  {feature.get('estimatedHours', 0)}h")
+
+    def _dependency_index(self, data, verify=False):
+        """Return the stored dependency index, rebuilding it if missing or inconsistent
+
+        verify=True also checks every edge against the stored order (O(V + E)),
+        catching hand edits to dependsOn. Returns None if the graph has a cycle.
+        """
+        records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+        index = data.get('dependencies')
+        consistent = bool(index) and len(index['order']) == len(records) and set(index['order']) == set(records)
+
+        if consistent and verify:
+            position = {feature_id: i for i, feature_id in enumerate(index['order'])}
+            expected = {}
+            for feature_id, feature in records.items():
+                for prerequisite in feature.get('dependsOn') or []:
+                    if prerequisite not in position:
+                        continue  # Dangling ids are ignored, as in the rebuild below
+                    expected.setdefault(prerequisite, []).append(feature_id)
+                    if position[prerequisite] >= position[feature_id]:
+                        consistent = False
+            consistent = consistent and expected == {key: value for key, value in index['dependents'].items() if value}
+        if consistent:
+            return index
+
+        # Full rebuild with Kahn's algorithm
+        dependents = {}
+        indegree = {feature_id: 0 for feature_id in records}
+        for feature_id, feature in records.items():
+            for prerequisite in feature.get('dependsOn') or []:
+                if prerequisite in records:
+                    dependents.setdefault(prerequisite, []).append(feature_id)
+                    indegree[feature_id] += 1
+
+        ready = [feature_id for feature_id, count in indegree.items() if count == 0]
+        order = []
+        while ready:
+            feature_id = ready.pop()
+            order.append(feature_id)
+            for dependent in dependents.get(feature_id, []):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(records):
+            cyclic = sorted(feature_id for feature_id, count in indegree.items() if count > 0)
+            print(f"❌ Dependency cycle among: {', '.join(cyclic)}")
+            return None
+
+        data['dependencies'] = {"order": order, "dependents": dependents}
+        return data['dependencies']
+
+    def _index_new_dependencies(self, index, feature):
+        """Add a new feature to an index built before it was appended; it cannot close a cycle"""
+        if index is None:
+            return
+        if feature['id'] not in index['order']:
+            index['order'].append(feature['id'])
+        for prerequisite in feature.get('dependsOn') or []:
+            dependents = index['dependents'].setdefault(prerequisite, [])
+            if feature['id'] not in dependents:
+                dependents.append(feature['id'])
+
+    def add_dependency(self, feature_id, prerequisite_id):
+        """Record that feature_id depends on prerequisite_id, rejecting cycles
+
+        Uses Pearce-Kelly dynamic topological ordering: only features whose
+        position lies between the two endpoints are searched and reordered.
+        """
+        data = self.load_backlog()
+        records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+        for required in (feature_id, prerequisite_id):
+            if required not in records:
+                print(f"❌ Feature {required} not found")
+                return False
+        if feature_id == prerequisite_id:
+            print("❌ A feature cannot depend on itself")
+            return False
+
+        # Verify edges first: the cycle search trusts the dependents map
+        index = self._dependency_index(data, verify=True)
+        if index is None:
+            return False
+        feature = records[feature_id]
+        if prerequisite_id in (feature.get('dependsOn') or []):
+            print(f"ℹ️  {feature_id} already depends on {prerequisite_id}")
+            return True
+
+        order = index['order']
+        position = {fid: i for i, fid in enumerate(order)}
+        lower, upper = position[feature_id], position[prerequisite_id]
+
+        if upper > lower:
+            # Forward search from the dependent, bounded by the prerequisite's position
+            forward, parents, stack = [], {feature_id: None}, [feature_id]
+            while stack:
+                current = stack.pop()
+                forward.append(current)
+                for dependent in index['dependents'].get(current, []):
+                    if dependent == prerequisite_id:
+                        cycle = [prerequisite_id, current]
+                        while parents[cycle[-1]] is not None:
+                            cycle.append(parents[cycle[-1]])
+                        print(f"❌ Adding this dependency would create a cycle: "
+                              f"{' → '.join(reversed(cycle))} → {feature_id}")
+                        return False
+                    if dependent not in parents and position[dependent] < upper:
+                        parents[dependent] = current
+                        stack.append(dependent)
+
+            # Backward search from the prerequisite, bounded by the dependent's position
+            backward, seen, stack = [], {prerequisite_id}, [prerequisite_id]
+            while stack:
+                current = stack.pop()
+                backward.append(current)
+                for required in records[current].get('dependsOn') or []:
+                    if required not in seen and required in position and position[required] > lower:
+                        seen.add(required)
+                        stack.append(required)
+
+            # Reassign the freed slots: prerequisites' ancestors first, then dependents
+            moved = sorted(backward, key=position.get) + sorted(forward, key=position.get)
+            for slot, fid in zip(sorted(position[fid] for fid in moved), moved):
+                order[slot] = fid
+
+        feature.setdefault('dependsOn', []).append(prerequisite_id)
+        index['dependents'].setdefault(prerequisite_id, []).append(feature_id)
+        self.save_backlog(data, [feature_id])
+        print(f"✅ {feature_id} now depends on {prerequisite_id}")
+        return True
+
+    def remove_dependency(self, feature_id, prerequisite_id):
+        """Drop a dependency edge; the existing order stays valid"""
+        data = self.load_backlog()
+        records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+        feature = records.get(feature_id)
+        if not feature or prerequisite_id not in (feature.get('dependsOn') or []):
+            print(f"❌ {feature_id} does not depend on {prerequisite_id}")
+            return False
+
+        index = self._dependency_index(data, verify=True)
+        feature['dependsOn'].remove(prerequisite_id)
+        if index is not None:
+            dependents = index['dependents'].get(prerequisite_id, [])
+            if feature_id in dependents:
+                dependents.remove(feature_id)
+            if not dependents:
+                index['dependents'].pop(prerequisite_id, None)
+        self.save_backlog(data, [feature_id])
+        print(f"✅ {feature_id} no longer depends on {prerequisite_id}")
+        return True
+
+    def _remaining_graph(self, data):
+        """Topological order, hours and dependents for incomplete features"""
+        index = self._dependency_index(data, verify=True)
+        if index is None:
+            return None
+        hours = {f['id']: f.get('estimatedHours') or 0
+                 for f in data['backlog']['features'] if f.get('status') != 'complete'}
+        order = [feature_id for feature_id in index['order'] if feature_id in hours]
+        return order, hours, index['dependents']
+
+    def critical_path(self, data):
+        """Longest chain of incomplete features by estimated hours"""
+        graph = self._remaining_graph(data)
+        if graph is None:
+            return None
+        order, hours, dependents = graph
+        finish, previous = {}, {}
+        for feature_id in order:
+            finish.setdefault(feature_id, 0)
+            finish[feature_id] += hours[feature_id]
+            for dependent in dependents.get(feature_id, []):
+                if dependent in hours and finish[feature_id] > finish.get(dependent, 0):
+                    finish[dependent] = finish[feature_id]
+                    previous[dependent] = feature_id
+
+        if not finish:
+            return [], 0
+        end = max(finish, key=finish.get)
+        path = [end]
+        while path[-1] in previous:
+            path.append(previous[path[-1]])
+        return list(reversed(path)), finish[end]
+
+    def schedule(self, data, developers=1):
+        """List-schedule incomplete features on N developers, longest remaining chain first
+
+        Returns (feature id, developer, start hour, end hour) rows and the makespan.
+        """
+        if developers < 1:
+            print("❌ At least one developer is required")
+            return None
+        graph = self._remaining_graph(data)
+        if graph is None:
+            return None
+        order, hours, dependents = graph
+
+        # Priority: hours left on the longest chain starting at each feature
+        tail = {}
+        for feature_id in reversed(order):
+            tail[feature_id] = hours[feature_id] + max(
+                (tail[d] for d in dependents.get(feature_id, []) if d in tail), default=0)
+
+        waiting = {feature_id: 0 for feature_id in order}
+        for feature_id in order:
+            for dependent in dependents.get(feature_id, []):
+                if dependent in waiting:
+                    waiting[dependent] += 1
+
+        ready = [(-tail[fid], fid) for fid, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+        free_developers = list(range(1, developers + 1))
+        running, rows, now = [], [], 0
+        while ready or running:
+            while ready and free_developers:
+                _, feature_id = heapq.heappop(ready)
+                developer = heapq.heappop(free_developers)
+                end = now + hours[feature_id]
+                rows.append((feature_id, developer, now, end))
+                heapq.heappush(running, (end, developer, feature_id))
+
+            now, developer, feature_id = heapq.heappop(running)
+            heapq.heappush(free_developers, developer)
+            for dependent in dependents.get(feature_id, []):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        heapq.heappush(ready, (-tail[dependent], dependent))
+
+        return rows, max((row[3] for row in rows), default=0)
+
+    def show_dependencies(self, view='order', developers=1, hours_per_day=8):
+        """Display topological order, critical path or a developer schedule"""
+        if not hours_per_day > 0:
+            print(f"❌ Hours per day must be greater than 0, got {hours_per_day}")
+            return False
+        data = self.load_backlog()
+        records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+
+        if view == 'order':
+            graph = self._remaining_graph(data)
+            if graph is None:
+                return
+            print(f"\n🧭 Dependency order ({len(graph[0])} incomplete features):")
+            print("-" * 80)
+            for step, feature_id in enumerate(graph[0], 1):
+                depends = ', '.join(records[feature_id].get('dependsOn') or []) or '-'
+                print(f"{step:>4}. {feature_id} - {records[feature_id]['name']} (after: {depends})")
+
+        elif view == 'critical-path':
+            result = self.critical_path(data)
+            if result is None:
+                return
+            path, total = result
+            print(f"\n🛤️  Critical path: {total}h (~{total / hours_per_day:.1f} days)")
+            print("-" * 80)
+            for feature_id in path:
+                print(f"   {feature_id} - {records[feature_id]['name']} "
+                      f"({records[feature_id].get('estimatedHours') or 0}h)")
+
+        else:
+            result = self.schedule(data, developers)
+            if result is None:
+                return
+            rows, makespan = result
+            print(f"\n📅 Schedule for {developers} developer(s): {makespan}h "
+                  f"(~{makespan / hours_per_day:.1f} days)")
+            print("-" * 80)
+            for feature_id, developer, start, end in sorted(rows, key=lambda row: (row[2], row[1])):
+                print(f"   dev {developer}: {start:>6}h → {end:>6}h  {feature_id} - {records[feature_id]['name']}")
+
+            finish_by_epic = {}
+            for feature_id, _, _, end in rows:
+                epic = records[feature_id].get('epic')
+                if epic:
+                    finish_by_epic[epic] = max(finish_by_epic.get(epic, 0), end)
+            if finish_by_epic:
+                print("\n🎯 Projected epic completion:")
+                for epic in data['backlog']['epics']:
+                    if epic['id'] in finish_by_epic:
+                        finish = date.today() + timedelta(days=round(finish_by_epic[epic['id']] / hours_per_day))
+                        print(f"   {epic['id']}: {finish.isoformat()} (target {epic.get('targetDate') or '-'})")
+
+    def _portfolio_roots(self, roots=None, pattern=None):
+        """Resolve explicit roots and glob matches to repositories with a backlog"""
+        candidates = list(roots or [])
+        if pattern:
+            candidates.extend(sorted(glob.glob(os.path.expanduser(pattern), recursive=True)))
+
+        resolved = []
+        for candidate in candidates:
+            root = Path(candidate).resolve()
+            if (root / ".feature-tracking" / "data" / "backlog.json").exists() and root not in resolved:
+                resolved.append(root)
+        return resolved
+
+    def load_portfolio(self, roots=None, pattern=None, jobs=None):
+        """Summarize many repositories, re-parsing only backlogs whose stamp changed"""
+        repos = self._portfolio_roots(roots, pattern)
+        cache = {}
+        if self.portfolio_cache_file.exists():
+            with open(self.portfolio_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+
+        summaries, stale = {}, []
+        for root in repos:
+            cached = cache.get(str(root))
+            if cached and cached['stamp'] == FeatureManager(root)._backlog_stamp():
+                summaries[str(root)] = cached
+            else:
+                stale.append(root)
+
+        workers = jobs or os.cpu_count() or 1
+        if len(stale) > 1 and workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(stale))) as pool:
+                fresh = list(pool.map(_summarize_repo, stale))
+        else:
+            fresh = [_summarize_repo(root) for root in stale]
+        for summary in fresh:
+            summaries[summary['root']] = summary
+
+        # Failed summaries are not cached, so a fixed backlog is picked up next run
+        fresh = [summary for summary in fresh if 'error' not in summary]
+        if fresh:
+            cache.update({summary['root']: summary for summary in fresh})
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.portfolio_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, separators=(',', ':'))
+
+        # Qualify ids with the repository name, adding parent directories on clashes
+        names = {}
+        for root in repos:
+            name, depth = root.name, 1
+            while name in names.values() and depth < len(root.parts):
+                depth += 1
+                name = '/'.join(root.parts[-depth:])
+            names[str(root)] = name
+
+        return [(names[str(root)], summaries[str(root)]) for root in repos], len(stale)
+
+    def show_portfolio(self, roots=None, pattern=None, jobs=None, text=None, status=None,
+                       epic=None, priority=None, tag=None):
+        """Display merged metrics, epic rollups and query results across repositories"""
+        repos, parsed = self.load_portfolio(roots, pattern, jobs)
+        if not repos:
+            print("❌ No repositories with .feature-tracking/data/backlog.json found")
+            return
+
+        for name, summary in repos:
+            if 'error' in summary:
+                print(f"❌ {name}: failed to load backlog ({summary['error']})")
+        repos = [(name, summary) for name, summary in repos if 'error' not in summary]
+        if not repos:
+            return
+
+        totals = {}
+        print(f"\n🏢 Portfolio ({len(repos)} repositories, {parsed} re-parsed):")
+        print("-" * 80)
+        for name, summary in repos:
+            metrics = summary['metrics']
+            for key, value in metrics.items():
+                totals[key] = totals.get(key, 0) + value
+            print(f"{name:<30} {metrics['backlogFeatures']:>5} backlog | {metrics['completedFeatures']:>5} done | "
+                  f"⏱️  {metrics['totalEstimatedHours']}h")
+        print("-" * 80)
+        print(f"{'Total':<30} {totals.get('backlogFeatures', 0):>5} backlog | "
+              f"{totals.get('completedFeatures', 0):>5} done | ⏱️  {totals.get('totalEstimatedHours', 0)}h")
+
+        epics = [(f"{name}:{e['id']}", e) for name, summary in repos for e in summary['epics']]
+        if epics:
+            print("\n🗂️  Epics:")
+            for qualified_id, e in epics:
+                rollup = e['rollup']
+                print(f"   {qualified_id} - {e['name']}: {rollup['percentComplete']}% | "
+                      f"{rollup['remainingHours']}h remaining | projected {self._projected_finish(e) or '-'}")
+
+        if not any((text, status, epic, priority, tag)):
+            return
+
+        terms = _search_terms(text or '')
+        matches = []
+        for name, summary in repos:
+            for feature in summary['features']:
+                if status and feature['status'] != status:
+                    continue
+                if epic and feature['epic'] != epic and f"{name}:{feature['epic']}" != epic:
+                    continue
+                if priority and feature['priority'] != priority:
+                    continue
+                if tag and tag not in feature['tags']:
+                    continue
+                if text:
+                    feature_terms = set(self._feature_terms(feature))
+                    if not terms or not all(term in feature_terms for term in terms):
+                        continue
+                matches.append(dict(feature, id=f"{name}:{feature['id']}"))
+
+        self._print_features(matches)
+
+    def _git(self, *args):
+        """Run a git command in the project root; None if git fails"""
+        try:
+            result = subprocess.run(["git", *args], cwd=self.project_root, capture_output=True, text=True)
+        except FileNotFoundError:
+            return None
+        return result.stdout if result.returncode == 0 else None
+
+    def _branch_index(self, features):
+        """Map branch slugs (<id>-<slug>, <linearIssue>-<slug>) to feature ids"""
+        index = {}
+        for feature in features:
+            slug = self._slugify(feature['name'])
+            index[f"{feature['id']}-{slug}"] = feature['id']
+            if feature.get('linearIssue'):
+                index[f"{feature['linearIssue']}-{slug}"] = feature['id']
+        return index
+
+    def _branch_counts(self, base_tip, tips):
+        """Ahead/behind counts of each tip against the base from one rev-list pass
+
+        Walks the combined history children-first, OR-ing a bitmask of which
+        tips reach each commit into its parents, then tallies masks.
+        """
+        names = list(tips)
+        output = self._git("rev-list", "--topo-order", "--parents", base_tip,
+                           *sorted({tips[name] for name in names}))
+        if output is None:
+            return {}
+
+        base_bit = 1 << len(names)
+        masks = {base_tip: base_bit}
+        for bit, name in enumerate(names):
+            masks[tips[name]] = masks.get(tips[name], 0) | (1 << bit)
+
+        tally = {}
+        for line in output.splitlines():
+            commit, *parents = line.split()
+            mask = masks.pop(commit, 0)
+            tally[mask] = tally.get(mask, 0) + 1
+            for parent in parents:
+                masks[parent] = masks.get(parent, 0) | mask
+
+        counts = {}
+        for bit, name in enumerate(names):
+            branch_bit = 1 << bit
+            ahead = sum(n for mask, n in tally.items() if mask & branch_bit and not mask & base_bit)
+            behind = sum(n for mask, n in tally.items() if mask & base_bit and not mask & branch_bit)
+            counts[name] = {'ahead': ahead, 'behind': behind, 'merged': ahead == 0}
+        return counts
+
+    def branch_status(self, features, base=None):
+        """Per-feature git branch state from one for-each-ref and one rev-list call
+
+        Returns {feature id: [branch info]}; results are cached until any ref moves.
+        """
+        # Full ref names: :short turns into heads/<name> when a tag shares the name
+        output = self._git("for-each-ref", "--format=%(refname)%00%(objectname)%00%(committerdate:iso-strict)",
+                           "refs/heads")
+        if output is None:
+            print("⚠️  Not a git repository; branch status unavailable")
+            return {}
+
+        refs = {}
+        for line in output.splitlines():
+            name, commit, committed = line.split('\0')
+            refs[name[len('refs/heads/'):]] = (commit, committed)
+
+        base_tip = None
+        if base in refs:
+            base_tip = refs[base][0]  # A local branch wins over a tag of the same name
+        elif base:
+            # Any revision git understands: origin/main, heads/main, a tag, a sha
+            resolved = self._git("rev-parse", "--verify", "--quiet", f"{base}^{{commit}}")
+            base_tip = resolved.strip() if resolved else None
+            if base_tip is None:
+                print(f"⚠️  Cannot resolve base '{base}'; ahead/behind counts unavailable")
+        else:
+            base = next((name for name in ('main', 'master') if name in refs), None)
+            base_tip = refs[base][0] if base else None
+
+        slug_index = self._branch_index(features)
+        feature_ids = set(slug_index.values())
+        matched = {}
+        for name in refs:
+            if not name.startswith('feature/'):
+                continue
+            rest = name[len('feature/'):]
+            feature_id = slug_index.get(rest)
+            if feature_id is None:
+                # Renamed features keep their id prefix
+                match = re.match(r'(feat-\d+)(?:-|$)', rest)
+                feature_id = match.group(1) if match and match.group(1) in feature_ids else None
+            if feature_id:
+                matched[name] = feature_id
+
+        counts = {}
+        if base_tip and matched:
+            cache_key = hashlib.sha1(f"{base_tip}\n{output}".encode('utf-8')).hexdigest()
+            cache = {}
+            if self.branch_cache_file.exists():
+                with open(self.branch_cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            if cache.get('key') == cache_key and set(matched) <= set(cache['counts']):
+                counts = cache['counts']
+            else:
+                counts = self._branch_counts(base_tip, {name: refs[name][0] for name in matched})
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(self.branch_cache_file, 'w', encoding='utf-8') as f:
+                    json.dump({'key': cache_key, 'counts': counts}, f)
+
+        status = {}
+        for name, feature_id in sorted(matched.items()):
+            info = {'branch': name, 'base': base, 'lastCommit': refs[name][1]}
+            info.update(counts.get(name, {}))
+            status.setdefault(feature_id, []).append(info)
+        return status
+
+    def _format_branch(self, branch):
+        """One-line description of a feature branch's state"""
+        if branch is None:
+            return "no branch"
+        parts = [branch['branch']]
+        if 'ahead' in branch:
+            parts.append(f"+{branch['ahead']}/-{branch['behind']} vs {branch['base']}")
+            if branch['merged']:
+                parts.append("merged")
+        parts.append(f"last commit {branch['lastCommit'][:10]}")
+        return ' | '.join(parts)
+
     def show_metrics(self):
         """Display backlog metrics"""
         data = self.load_backlog()
@@ -257,6 +2013,460 @@ class FeatureManager:
             completion_rate = metrics['completedFeatures'] / metrics['totalFeatures'] * 100
             print(f"Completion Rate: {completion_rate:.1f}%")
 
+    def _empty_index(self):
+        """Create empty derived-state index structure"""
+        return {
+            "version": INDEX_VERSION,
+            "stamps": {},      # source path -> [mtime_ns, size]
+            "metricsStamp": None,  # backlog stamp whose metrics and rollups were last written back
+            "features": {},    # feature id -> hash, section, hours, terms
+            "docs": {},        # doc path -> content hash
+            "docPaths": {},    # feature id -> doc path
+            "postings": {},    # search term -> sorted feature ids
+            "metrics": {
+                "totalFeatures": 0,
+                "backlogFeatures": 0,
+                "completedFeatures": 0,
+                "totalEstimatedHours": 0
+            }
+        }
+
+    def _load_index(self):
+        """Load the derived-state index, starting fresh if missing or outdated"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self._empty_index()
+
+        if index.get('version') != INDEX_VERSION:
+            return self._empty_index()
+        return index
+
+    def _save_index(self, index):
+        """Atomically write the derived-state index"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(index, ensure_ascii=False, separators=(',', ':')))
+        os.replace(tmp_file, self.index_file)
+
+    def _relative_path(self, path):
+        """Project-relative POSIX path used as an index key"""
+        return Path(path).relative_to(self.project_root).as_posix()
+
+    def _scan_sources(self):
+        """Stat the backlog file and every markdown doc under docs/features"""
+        stamps = {}
+        candidates = [str(self.backlog_file)]
+        for dirpath, _, filenames in os.walk(self.features_dir):
+            candidates.extend(os.path.join(dirpath, name) for name in filenames if name.endswith('.md'))
+
+        for path in candidates:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamps[self._relative_path(path)] = [stat.st_mtime_ns, stat.st_size]
+        return stamps
+
+    def _feature_terms(self, feature):
+        """Search terms for a feature's name, description and tags"""
+        text = ' '.join([feature.get('name') or '', feature.get('description') or '']
+                        + list(feature.get('tags') or []))
+        return sorted(set(_search_terms(text)))
+
+    def _hash_feature(self, feature):
+        """Stable content hash of a feature record"""
+        encoded = json.dumps(feature, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha1(encoded).hexdigest()
+
+    def _count_feature(self, metrics, entry, sign):
+        """Add (sign=1) or remove (sign=-1) one feature's share of the metrics"""
+        key = 'backlogFeatures' if entry['section'] == 'backlog' else 'completedFeatures'
+        metrics[key] += sign
+        metrics['totalFeatures'] += sign
+        metrics['totalEstimatedHours'] += sign * entry['hours']
+
+    def _unindex_feature(self, index, feature_id):
+        """Drop a feature's postings and metric contributions"""
+        entry = index['features'].pop(feature_id)
+        for term in entry['terms']:
+            ids = index['postings'].get(term, [])
+            position = bisect.bisect_left(ids, feature_id)
+            if position < len(ids) and ids[position] == feature_id:
+                ids.pop(position)
+            if not ids:
+                index['postings'].pop(term, None)
+        self._count_feature(index['metrics'], entry, -1)
+
+    def _index_features(self, index, data, only=None):
+        """Fold changed feature records into the index and return their ids
+
+        With only, just those ids are re-hashed; the caller knows nothing else changed.
+        """
+        current = {}
+        for section in ('backlog', 'completed'):
+            for feature in data[section]['features']:
+                current[feature['id']] = (section, feature)
+
+        if only is None:
+            changed = [feature_id for feature_id in index['features'] if feature_id not in current]
+            candidates = current
+        else:
+            changed = [feature_id for feature_id in only if feature_id not in current]
+            candidates = {feature_id: current[feature_id] for feature_id in only if feature_id in current}
+        for feature_id in changed:
+            if feature_id in index['features']:
+                self._unindex_feature(index, feature_id)
+
+        for feature_id, (section, feature) in candidates.items():
+            digest = self._hash_feature(feature)
+            entry = index['features'].get(feature_id)
+            if entry and entry['hash'] == digest and entry['section'] == section:
+                continue
+            if entry:
+                self._unindex_feature(index, feature_id)
+
+            entry = {
+                "hash": digest,
+                "section": section,
+                "hours": (feature.get('estimatedHours') or 0) if section == 'backlog' else 0,
+                "terms": self._feature_terms(feature)
+            }
+            index['features'][feature_id] = entry
+            for term in entry['terms']:
+                bisect.insort(index['postings'].setdefault(term, []), feature_id)
+            self._count_feature(index['metrics'], entry, 1)
+            changed.append(feature_id)
+
+        return changed
+
+    def _index_docs(self, index, changed_paths, removed_paths):
+        """Re-hash changed docs, update doc paths and return the docs that differ"""
+        changed = []
+        for rel_path in removed_paths:
+            index['docs'].pop(rel_path, None)
+            match = FEATURE_DOC_PATTERN.match(Path(rel_path).name)
+            if match and index['docPaths'].get(match.group(1)) == rel_path:
+                del index['docPaths'][match.group(1)]
+            changed.append(rel_path)
+
+        for rel_path in changed_paths:
+            try:
+                content = (self.project_root / rel_path).read_bytes()
+            except FileNotFoundError:
+                continue
+            digest = hashlib.sha1(content).hexdigest()
+            if index['docs'].get(rel_path) == digest:
+                continue
+
+            index['docs'][rel_path] = digest
+            match = FEATURE_DOC_PATTERN.match(Path(rel_path).name)
+            if match:
+                index['docPaths'][match.group(1)] = rel_path
+            changed.append(rel_path)
+
+        return changed
+
+    def _refresh_epic_rollups(self, data, changed_ids):
+        """Recompute rollups of epics that contain changed features; True if any moved"""
+        changed_ids = set(changed_ids)
+        records = None
+        refreshed = False
+        for epic in data['backlog']['epics']:
+            if not changed_ids.intersection(epic.get('features', [])):
+                continue
+            if records is None:
+                records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+            previous = epic.get('rollup')
+            if self._compute_rollup(epic, records) != previous:
+                refreshed = True
+        return refreshed
+
+    def _apply_source_changes(self, index, stamps, write_metrics=False):
+        """Update the index for sources whose stamps moved; return changed features and docs"""
+        previous = index['stamps']
+        touched = [path for path, stamp in stamps.items() if previous.get(path) != stamp]
+        removed = [path for path in previous if path not in stamps]
+        index['stamps'] = dict(stamps)
+
+        backlog_key = self._relative_path(self.backlog_file)
+        changed_features = []
+        data = None
+        # Read-only syncs absorb hand edits without writing metrics back, so the
+        # stamp the metrics were last written for is tracked on its own
+        metrics_behind = write_metrics and index.get('metricsStamp') != stamps.get(backlog_key)
+        if backlog_key in touched or backlog_key in removed or metrics_behind:
+            try:
+                data = self.load_backlog()
+            except json.JSONDecodeError as e:
+                # Likely saved mid-edit: the indexed features stay as they were, and
+                # the next save moves the stamp again so it is retried then
+                print(f"⚠️  Skipping invalid {self.backlog_file.name} ({e}); will retry on next change")
+
+        if data is not None:
+            # create/move/deps leave a hint naming the features their saves touched
+            hint = self._load_index_hint()
+            if hint and hint['base'] == previous.get(backlog_key) and hint['stamp'] == stamps.get(backlog_key):
+                changed_features = self._index_features(index, data, hint['features'])
+                if index.get('metricsStamp') == hint['base']:
+                    index['metricsStamp'] = hint['stamp']  # Those saves kept metrics and rollups current
+            else:
+                changed_features = self._index_features(index, data)
+            if hint:
+                self.index_hint_file.unlink(missing_ok=True)  # Absorbed; later saves start a new chain
+
+            if write_metrics and backlog_key in stamps:
+                # Edits absorbed since the last write are unknown, so then check every epic
+                in_step = index.get('metricsStamp') in (previous.get(backlog_key), stamps.get(backlog_key))
+                counters = {key: data['metrics'].get(key) for key in index['metrics']}
+                rollups_changed = self._refresh_epic_rollups(
+                    data, changed_features if in_step else list(index['features']))
+                if counters != index['metrics'] or rollups_changed:
+                    data['metrics'].update(index['metrics'])
+                    self._write_backlog_file(data)
+                    stat = os.stat(self.backlog_file)
+                    index['stamps'][backlog_key] = [stat.st_mtime_ns, stat.st_size]
+                index['metricsStamp'] = index['stamps'][backlog_key]
+
+        changed_docs = self._index_docs(
+            index,
+            [path for path in touched if path != backlog_key],
+            [path for path in removed if path != backlog_key]
+        )
+        return changed_features, changed_docs
+
+    def sync_index(self, write_metrics=False):
+        """Bring the derived index up to date with the backlog and docs on disk"""
+        index = self._load_index()
+        stamps = self._scan_sources()
+        backlog_stamp = stamps.get(self._relative_path(self.backlog_file))
+        if stamps != index['stamps'] or (write_metrics and index.get('metricsStamp') != backlog_stamp):
+            self._apply_source_changes(index, stamps, write_metrics)
+            self._save_index(index)
+        return index
+
+    def watch(self, interval=0.5, debounce=1.0):
+        """Watch the backlog and feature docs, refreshing derived state on change"""
+        index = self.sync_index(write_metrics=True)
+        print(f"👀 Watching {self.backlog_file} and {self.features_dir} (Ctrl+C to stop)")
+
+        last_stamps = dict(index['stamps'])
+        pending_since = None
+        try:
+            while True:
+                time.sleep(interval)
+                stamps = self._scan_sources()
+
+                # Keep waiting while a burst (e.g. git checkout) is still landing
+                if stamps != last_stamps:
+                    last_stamps = stamps
+                    pending_since = time.monotonic()
+                    continue
+                if pending_since is None or time.monotonic() - pending_since < debounce:
+                    continue
+
+                pending_since = None
+                features, docs = self._apply_source_changes(index, stamps, write_metrics=True)
+                self._save_index(index)
+                last_stamps = dict(index['stamps'])
+
+                if features or docs:
+                    print(f"🔄 {datetime.now().strftime('%H:%M:%S')} "
+                          f"updated {len(features)} feature(s), {len(docs)} doc(s)")
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+
+    def _date_timestamp(self, value):
+        """Unix timestamp for UTC midnight of a YYYY-MM-DD date string, matching how events are read back"""
+        return int(datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+    def _event_ids(self):
+        """Feature ids referenced by position from the event log"""
+        try:
+            with open(self.events_dir / "features.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _append_events(self, rows):
+        """Append (timestamp, feature id, old status, new status) rows to the event log"""
+        os.makedirs(self.events_dir, exist_ok=True)
+        ids = self._event_ids()
+        positions = {feature_id: i for i, feature_id in enumerate(ids)}
+        known_ids = len(ids)
+
+        columns = {name: array(typecode) for name, (typecode, _) in EVENT_COLUMNS.items()}
+        for timestamp, feature_id, old_status, new_status in rows:
+            if feature_id not in positions:
+                positions[feature_id] = len(ids)
+                ids.append(feature_id)
+            columns['ts'].append(int(timestamp))
+            columns['feature'].append(positions[feature_id])
+            columns['from'].append(STATUSES.index(old_status) if old_status in STATUSES else -1)
+            columns['to'].append(STATUSES.index(new_status) if new_status in STATUSES else -1)
+
+        if len(ids) != known_ids:
+            with open(self.events_dir / "features.json", 'w', encoding='utf-8') as f:
+                json.dump(ids, f)
+
+        self._trim_event_columns()
+        for name, column in columns.items():
+            if sys.byteorder == 'big':
+                column.byteswap()
+            with open(self.events_dir / f"{name}.bin", 'ab') as f:
+                column.tofile(f)
+
+    def _trim_event_columns(self):
+        """Cut every column file back to the common row count
+
+        A crash between the per-column appends leaves some files longer than
+        others; appending on top of that would pair values from different rows.
+        """
+        paths = {name: self.events_dir / f"{name}.bin" for name in EVENT_COLUMNS}
+        sizes = {name: path.stat().st_size if path.exists() else 0 for name, path in paths.items()}
+        itemsizes = {name: array(typecode).itemsize for name, (typecode, _) in EVENT_COLUMNS.items()}
+        rows = min(sizes[name] // itemsizes[name] for name in EVENT_COLUMNS)
+        for name, path in paths.items():
+            if sizes[name] != rows * itemsizes[name]:
+                os.truncate(path, rows * itemsizes[name])
+
+    def _record_event(self, feature_id, old_status, new_status):
+        """Record one status transition in the event log"""
+        self._append_events([(time.time(), feature_id, old_status, new_status)])
+
+    def _ensure_event_log(self, data):
+        """Seed the event log from recorded dates the first time it is used"""
+        if (self.events_dir / "ts.bin").exists():
+            return
+
+        rows = []
+        for feature in data['backlog']['features']:
+            if feature.get('createdDate'):
+                rows.append((self._date_timestamp(feature['createdDate']), feature['id'], None, 'backlog'))
+            if feature.get('status', 'backlog') != 'backlog':
+                # Transition time is unknown; the last backlog update is the closest bound
+                rows.append((self._date_timestamp(data['lastUpdated']), feature['id'],
+                             'backlog', feature['status']))
+        for feature in data['completed']['features']:
+            if feature.get('createdDate'):
+                rows.append((self._date_timestamp(feature['createdDate']), feature['id'], None, 'backlog'))
+            if feature.get('completedDate'):
+                rows.append((self._date_timestamp(feature['completedDate']), feature['id'], None, 'complete'))
+
+        rows.sort(key=lambda row: row[0])
+        self._append_events(rows)
+
+    def _load_event_columns(self):
+        """Load the event log as NumPy arrays, trimming any partially written row"""
+        columns = {}
+        for name, (_, dtype) in EVENT_COLUMNS.items():
+            path = self.events_dir / f"{name}.bin"
+            columns[name] = np.fromfile(path, dtype=dtype) if path.exists() else np.empty(0, dtype=dtype)
+
+        rows = min(len(column) for column in columns.values())
+        return {name: column[:rows] for name, column in columns.items()}
+
+    def _print_percentiles(self, label, values):
+        """Print p50/p85/p95 of a duration array given in seconds"""
+        if len(values) == 0:
+            print(f"{label:<14} no data")
+            return
+        p50, p85, p95 = np.percentile(values / 86400.0, [50, 85, 95])
+        print(f"{label:<14} p50 {p50:6.1f}d | p85 {p85:6.1f}d | p95 {p95:6.1f}d | n={len(values)}")
+
+    def show_analytics(self, epic=None, weeks=12):
+        """Display lead/cycle time, stage dwell, weekly throughput and epic burndown"""
+        if np is None:
+            print("❌ Analytics requires NumPy (pip install numpy)")
+            return
+
+        data = self.load_backlog()
+        self._ensure_event_log(data)
+        ids = self._event_ids()
+        events = self._load_event_columns()
+        ts, feat, to = events['ts'], events['feature'], events['to']
+
+        records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+        epic_names = sorted({f['epic'] for f in records.values() if f.get('epic')})
+        if epic and epic not in epic_names and not self._find_epic(data, epic):
+            print(f"❌ Epic {epic} not found")
+            return
+        epic_codes = {name: i for i, name in enumerate(epic_names)}
+        feature_epic = np.array([epic_codes.get(records.get(fid, {}).get('epic'), -1) for fid in ids],
+                                dtype=np.int32)
+        feature_hours = np.array([records.get(fid, {}).get('estimatedHours') or 0 for fid in ids],
+                                 dtype=np.float64)
+
+        if epic:
+            keep = feature_epic[feat] == epic_codes.get(epic, -2)
+            ts, feat, to = ts[keep], feat[keep], to[keep]
+
+        # Group each feature's events chronologically (lexsort is stable for ties)
+        order = np.lexsort((ts, feat))
+        ts, feat, to = ts[order], feat[order], to[order]
+
+        never = np.iinfo(np.int64).max
+        first_seen = np.full(len(ids), never, dtype=np.int64)
+        is_created = to == STATUSES.index('backlog')
+        np.minimum.at(first_seen, feat[is_created], ts[is_created])
+        started = np.full(len(ids), never, dtype=np.int64)
+        is_active = to == STATUSES.index('active')
+        np.minimum.at(started, feat[is_active], ts[is_active])
+        finished_at = np.full(len(ids), -1, dtype=np.int64)
+        is_complete = to == STATUSES.index('complete')
+        np.maximum.at(finished_at, feat[is_complete], ts[is_complete])
+
+        finished = finished_at >= 0
+        seen = first_seen != never
+        lead_times = (finished_at - first_seen)[finished & seen]
+        cycle_times = (finished_at - started)[finished & (started != never)]
+
+        title = f"Epic {epic}" if epic else "Project"
+        print(f"\n📈 {title} Analytics ({len(ts)} events):")
+        print("-" * 80)
+        self._print_percentiles("Lead time", lead_times)
+        self._print_percentiles("Cycle time", cycle_times)
+
+        # Dwell time: gap between entering a stage and the feature's next event
+        same_feature = feat[1:] == feat[:-1]
+        dwell = (ts[1:] - ts[:-1])[same_feature]
+        stages = to[:-1][same_feature]
+        print("\n⏳ Time in stage:")
+        for code, status in enumerate(STATUSES[:-1]):
+            self._print_percentiles(f"  {status}", dwell[stages == code])
+
+        # Weekly throughput, counted on Monday-based UTC weeks
+        first_monday = date(1970, 1, 5)
+        current_week = ((datetime.now(timezone.utc).date() - first_monday).days) // 7
+        low_week = current_week - weeks + 1
+        done_weeks = (finished_at[finished] // 86400 - 4) // 7
+        recent = done_weeks[done_weeks >= low_week] - low_week
+        throughput = np.bincount(recent, minlength=weeks)[:weeks]
+
+        print("\n🚚 Weekly throughput:")
+        for offset, count in enumerate(throughput):
+            week_start = first_monday + timedelta(weeks=low_week + offset)
+            print(f"  {week_start}  {'█' * int(count)} {int(count)}")
+
+        # Burndown: scope added by creation week minus hours completed by week
+        created_weeks = np.clip((first_seen // 86400 - 4) // 7 - low_week, 0, weeks - 1)
+        completed_weeks = np.clip((finished_at // 86400 - 4) // 7 - low_week, 0, weeks - 1)
+        burndown_epics = [epic] if epic else epic_names
+
+        print("\n🔥 Epic burndown (remaining hours):")
+        if not burndown_epics:
+            print("  No epics with member features")
+        for name in burndown_epics:
+            member = (feature_epic == epic_codes.get(name, -2)) & seen
+            scope = np.cumsum(np.bincount(created_weeks[member], weights=feature_hours[member],
+                                          minlength=weeks))
+            done = np.cumsum(np.bincount(completed_weeks[member & finished],
+                                         weights=feature_hours[member & finished], minlength=weeks))
+            remaining = ' '.join(f"{value:.0f}" for value in scope - done)
+            print(f"  {name}: {remaining}")
+
 def main():
     parser = argparse.ArgumentParser(description='Feature Management for ShipsMind Project')
     parser.add_argument('--project-root', help='Project root directory')
@@ -275,21 +2485,107 @@ def main():
     create_parser.add_argument('--value', choices=['high', 'medium', 'low'],
                              default='medium', help='Business value')
     create_parser.add_argument('--linear', help='Linear issue ID (e.g., LIN-123)')
+    create_parser.add_argument('--depends-on', nargs='*', help='Feature IDs this feature is blocked by')
 
     # Move feature command
     move_parser = subparsers.add_parser('move', help='Move feature to different status')
     move_parser.add_argument('feature_id', help='Feature ID to move')
-    move_parser.add_argument('status', choices=['backlog', 'planning', 'active', 'review', 'testing', 'complete'],
+    move_parser.add_argument('status', choices=STATUSES,
                            help='New status')
 
     # List features command
     list_parser = subparsers.add_parser('list', help='List features')
-    list_parser.add_argument('--status', choices=['backlog', 'planning', 'active', 'review', 'testing', 'complete'],
+    list_parser.add_argument('--status', choices=STATUSES,
                            help='Filter by status')
+    list_parser.add_argument('--branches', action='store_true', help='Show git branch state per feature')
+    list_parser.add_argument('--base', help='Revision to compare against, e.g. origin/main (default: main, then master)')
 
     # Metrics command
     subparsers.add_parser('metrics', help='Show project metrics')
 
+    # Query command
+    query_parser = subparsers.add_parser('query', help='Search features by text and filters')
+    query_parser.add_argument('text', nargs='?', help='Search terms matched against name, description and tags')
+    query_parser.add_argument('--status', choices=STATUSES,
+                            help='Filter by status')
+    query_parser.add_argument('--epic', help='Filter by epic ID')
+    query_parser.add_argument('--priority', choices=['critical', 'high', 'medium', 'low'],
+                            help='Filter by priority')
+    query_parser.add_argument('--tag', help='Filter by tag')
+    query_parser.add_argument('--branches', action='store_true', help='Show git branch state per feature')
+    query_parser.add_argument('--base', help='Revision to compare against, e.g. origin/main (default: main, then master)')
+
+    # Dependency commands
+    deps_parser = subparsers.add_parser('deps', help='Manage and analyze feature dependencies')
+    deps_parser.add_argument('action', choices=['add', 'remove', 'order', 'critical-path', 'schedule'],
+                           help='Edit an edge or show order, critical path or schedule')
+    deps_parser.add_argument('feature_id', nargs='?', help='Dependent feature (add/remove)')
+    deps_parser.add_argument('prerequisite_id', nargs='?', help='Feature it is blocked by (add/remove)')
+    deps_parser.add_argument('--devs', type=_positive_int, default=1, help='Developers available for schedule')
+    deps_parser.add_argument('--hours-per-day', type=_positive_float, default=8, help='Working hours per day')
+
+    # Next command
+    next_parser = subparsers.add_parser('next', help='Show the top-ranked unassigned features')
+    next_parser.add_argument('--top', type=_positive_int, default=5, help='Number of features to show')
+    next_parser.add_argument('--epic', help='Restrict to one epic')
+    next_parser.add_argument('--rescore', action='store_true', help='Recompute every score')
+
+    # Dedupe command
+    dedupe_parser = subparsers.add_parser('dedupe', help='Cluster likely duplicate features')
+    dedupe_parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD,
+                             help='Minimum estimated similarity (0-1)')
+
+    # Epics command
+    epics_parser = subparsers.add_parser('epics', help='Show epic progress rollups')
+    epics_parser.add_argument('--check', action='store_true', help='Verify memberships and rollups')
+    epics_parser.add_argument('--rebuild', action='store_true', help='Recompute all rollups from scratch')
+
+    # Analytics command
+    analytics_parser = subparsers.add_parser('analytics', help='Show cycle time, throughput and burndown')
+    analytics_parser.add_argument('--epic', help='Restrict analytics to one epic')
+    analytics_parser.add_argument('--weeks', type=_positive_int, default=12, help='Weeks of throughput and burndown')
+
+    # Export command
+    export_parser = subparsers.add_parser('export', help='Export features, epics or events')
+    export_parser.add_argument('--format', choices=['csv', 'jsonl', 'parquet', 'arrow', 'npz', 'columnar'],
+                             default='csv', help='Output format (columnar picks parquet or npz)')
+    export_parser.add_argument('--entity', choices=list(EXPORT_FIELDS), default='features',
+                             help='What to export')
+    export_parser.add_argument('--fields', help='Comma-separated fields to include')
+    export_parser.add_argument('--output', '-o', help='Output file (defaults to stdout for csv/jsonl)')
+    export_parser.add_argument('--chunk-size', type=_positive_int, default=10000, help='Rows written per chunk')
+    export_parser.add_argument('--text', help='Search terms matched against name, description and tags')
+    export_parser.add_argument('--status', choices=STATUSES, help='Filter by status')
+    export_parser.add_argument('--epic', help='Filter by epic ID')
+    export_parser.add_argument('--priority', choices=['critical', 'high', 'medium', 'low'],
+                             help='Filter by priority')
+    export_parser.add_argument('--tag', help='Filter by tag')
+
+    # Report command
+    report_parser = subparsers.add_parser('report', help='Generate a static feature report site')
+    report_parser.add_argument('--format', choices=['html', 'markdown'], default='html', help='Page format')
+    report_parser.add_argument('--output', '-o', help='Output directory (default: .feature-tracking/reports)')
+    report_parser.add_argument('--jobs', '-j', type=int, help='Render processes (default: all cores)')
+    report_parser.add_argument('--force', action='store_true', help='Re-render every page')
+
+    # Portfolio command
+    portfolio_parser = subparsers.add_parser('portfolio', help='Aggregate backlogs across repositories')
+    portfolio_parser.add_argument('roots', nargs='*', help='Repository roots')
+    portfolio_parser.add_argument('--glob', help="Glob matching repository roots (e.g. '~/src/*')")
+    portfolio_parser.add_argument('--jobs', '-j', type=int, help='Processes used to parse backlogs')
+    portfolio_parser.add_argument('--text', help='Search terms matched against name, description and tags')
+    portfolio_parser.add_argument('--status', choices=STATUSES, help='Filter features by status')
+    portfolio_parser.add_argument('--epic', help='Filter by epic ID (optionally repo:epic-id)')
+    portfolio_parser.add_argument('--priority', choices=['critical', 'high', 'medium', 'low'],
+                                help='Filter by priority')
+    portfolio_parser.add_argument('--tag', help='Filter by tag')
+
+    # Watch command
+    watch_parser = subparsers.add_parser('watch', help='Rebuild derived state when backlog or docs change')
+    watch_parser.add_argument('--interval', type=float, default=0.5, help='Seconds between filesystem scans')
+    watch_parser.add_argument('--debounce', type=float, default=1.0,
+                            help='Quiet seconds required before applying a burst of changes')
+
     args = parser.parse_args()
 
     if not args.command:
@@ -307,14 +2603,55 @@ def main():
             estimated_hours=args.hours,
             tags=args.tags,
             business_value=args.value,
-            linear_issue=args.linear
+            linear_issue=args.linear,
+            depends_on=args.depends_on
         )
     elif args.command == 'move':
         fm.move_feature(args.feature_id, args.status)
     elif args.command == 'list':
-        fm.list_features(args.status)
+        fm.list_features(args.status, args.branches, args.base)
     elif args.command == 'metrics':
         fm.show_metrics()
+    elif args.command == 'query':
+        fm.show_query(args.text, args.status, args.epic, args.priority, args.tag, args.branches, args.base)
+    elif args.command == 'deps':
+        if args.action in ('add', 'remove'):
+            if not args.feature_id or not args.prerequisite_id:
+                parser.error(f"deps {args.action} requires FEATURE_ID and PREREQUISITE_ID")
+            if args.action == 'add':
+                fm.add_dependency(args.feature_id, args.prerequisite_id)
+            else:
+                fm.remove_dependency(args.feature_id, args.prerequisite_id)
+        else:
+            fm.show_dependencies(args.action, args.devs, args.hours_per_day)
+    elif args.command == 'next':
+        fm.show_next(args.top, args.epic, args.rescore)
+    elif args.command == 'dedupe':
+        fm.show_duplicates(args.threshold)
+    elif args.command == 'epics':
+        fm.show_epics(args.check, args.rebuild)
+    elif args.command == 'analytics':
+        fm.show_analytics(args.epic, args.weeks)
+    elif args.command == 'export':
+        fm.export(
+            file_format=args.format,
+            entity=args.entity,
+            fields=args.fields.split(',') if args.fields else None,
+            output=args.output,
+            chunk_size=args.chunk_size,
+            text=args.text,
+            status=args.status,
+            epic=args.epic,
+            priority=args.priority,
+            tag=args.tag
+        )
+    elif args.command == 'report':
+        fm.generate_report(args.format, args.output, args.jobs, args.force)
+    elif args.command == 'portfolio':
+        fm.show_portfolio(args.roots, args.glob, args.jobs, args.text, args.status,
+                          args.epic, args.priority, args.tag)
+    elif args.command == 'watch':
+        fm.watch(args.interval, args.debounce)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
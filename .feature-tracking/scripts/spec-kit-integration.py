@@ -8,6 +8,7 @@ import json
 import os
 import sys
 import subprocess
+import importlib.util
 from pathlib import Path
 from datetime import datetime
 import re
@@ -67,8 +68,12 @@ class SpecKitIntegration:
         feature_name = self._extract_feature_name(spec_description)
 
         # Import and use feature manager
-        sys.path.append(str(self.project_root / ".feature-tracking" / "scripts"))
-        from feature_manager import FeatureManager
+        # feature-manager.py is not an importable module name, so load it by path
+        script = Path(__file__).resolve().parent / "feature-manager.py"
+        spec = importlib.util.spec_from_file_location("feature_manager", script)
+        feature_manager = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(feature_manager)
+        FeatureManager = feature_manager.FeatureManager
 
         fm = FeatureManager(self.project_root)
         feature_id = fm.create_feature(
@@ -0,0 +1,439 @@
+"""Tests for .feature-tracking/scripts/feature-manager.py
+
+The script's file name is not importable, so it is loaded by path.
+"""
+
+import csv
+import importlib.util
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "feature-manager.py"
+_spec = importlib.util.spec_from_file_location("feature_manager", SCRIPT)
+feature_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(feature_manager)
+
+
+@pytest.fixture
+def fm(tmp_path):
+    return feature_manager.FeatureManager(tmp_path)
+
+
+def _edit_backlog(fm, edit):
+    """Change backlog.json behind the manager's back, as a hand edit would"""
+    with open(fm.backlog_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    edit(data)
+    with open(fm.backlog_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def _feature(data, feature_id):
+    return next(f for f in data['backlog']['features'] if f['id'] == feature_id)
+
+
+def _assert_valid_order(data):
+    order = data['dependencies']['order']
+    position = {feature_id: i for i, feature_id in enumerate(order)}
+    records = data['backlog']['features'] + data['completed']['features']
+    assert sorted(order) == sorted(f['id'] for f in records)
+    for feature in records:
+        for prerequisite in feature.get('dependsOn') or []:
+            assert position[prerequisite] < position[feature['id']], (prerequisite, feature['id'])
+
+
+def test_create_indexes_dependencies_in_order(fm):
+    first = fm.create_feature("Login", "Sign in with email")
+    second = fm.create_feature("Profile", "Edit the user profile", depends_on=[first])
+    fm.create_feature("Avatar", "Upload a profile picture", depends_on=[second, first])
+
+    _assert_valid_order(fm.load_backlog())
+
+
+def test_add_dependency_keeps_order_valid(fm):
+    ids = [fm.create_feature(f"Feature {n}", f"Description {n}") for n in range(5)]
+
+    assert fm.add_dependency(ids[0], ids[4])
+    assert fm.add_dependency(ids[4], ids[2])
+    assert fm.add_dependency(ids[1], ids[0])
+
+    data = fm.load_backlog()
+    assert _feature(data, ids[0])['dependsOn'] == [ids[4]]
+    _assert_valid_order(data)
+
+
+def test_add_dependency_rejects_cycle_after_hand_edit(fm, capsys):
+    first = fm.create_feature("Login", "Sign in with email")
+    second = fm.create_feature("Profile", "Edit the user profile", depends_on=[first])
+    third = fm.create_feature("Avatar", "Upload a profile picture")
+
+    # The stored dependency index does not know about this edge
+    _edit_backlog(fm, lambda data: _feature(data, first)['dependsOn'].append(third))
+
+    assert not fm.add_dependency(third, second)
+    assert "cycle" in capsys.readouterr().out
+    assert _feature(fm.load_backlog(), third)['dependsOn'] == []
+
+
+def test_query_uses_unicode_terms(fm):
+    fm.create_feature("用户登录", "支持邮箱登录")
+    fm.create_feature("数据导出", "导出为 CSV")
+
+    assert [f['name'] for f in fm.query_features(text="登录")] == ["用户登录"]
+    assert [f['name'] for f in fm.query_features(text="csv")] == ["数据导出"]
+    assert fm.query_features(text="!!") == []
+
+
+def _git(repo, *args):
+    result = subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_branch_counts_match_rev_list(fm, tmp_path):
+    repo = tmp_path
+    _git(repo, "init", "-q", "-b", "main")
+
+    def commit(message):
+        _git(repo, "commit", "-q", "--allow-empty", "-m", message)
+
+    commit("root")
+    commit("base work")
+    _git(repo, "checkout", "-q", "-b", "feature/one")
+    commit("one: first")
+    commit("one: second")
+    _git(repo, "checkout", "-q", "-b", "feature/two", "main")
+    commit("two: first")
+    _git(repo, "checkout", "-q", "main")
+    commit("main moves on")
+    _git(repo, "merge", "-q", "--no-ff", "-m", "merge two", "feature/two")
+    _git(repo, "checkout", "-q", "-b", "feature/three", "HEAD~1")
+    commit("three: first")
+    _git(repo, "checkout", "-q", "main")
+    commit("main after merge")
+    _git(repo, "branch", "feature/merged", "HEAD~2")
+
+    branches = ["feature/one", "feature/two", "feature/three", "feature/merged"]
+    tips = {name: _git(repo, "rev-parse", name) for name in branches}
+    counts = fm._branch_counts(_git(repo, "rev-parse", "main"), tips)
+
+    for name in branches:
+        behind, ahead = map(int, _git(repo, "rev-list", "--left-right", "--count", f"main...{name}").split())
+        assert counts[name] == {'ahead': ahead, 'behind': behind, 'merged': ahead == 0}, name
+
+
+def test_watch_sync_writes_back_edits_absorbed_by_read_only_sync(fm):
+    fm.create_feature("Login", "Sign in with email", epic="epic-001", estimated_hours=10)
+    fm.create_feature("Profile", "Edit the user profile", epic="epic-001", estimated_hours=20)
+    _edit_backlog(fm, lambda data: data['backlog']['epics'].append(
+        {'id': 'epic-001', 'name': 'Accounts', 'features': ['feat-001', 'feat-002']}))
+    fm.show_epics(rebuild=True)
+
+    _edit_backlog(fm, lambda data: _feature(data, 'feat-001').update(estimatedHours=5))
+    fm.query_features(text="login")  # Absorbs the edit into the index without writing metrics
+    fm.sync_index(write_metrics=True)
+
+    data = fm.load_backlog()
+    assert data['metrics']['totalEstimatedHours'] == 25
+    assert fm.check_epics(data) == []
+
+
+def test_move_finds_relocated_doc_without_syncing_index(fm, monkeypatch):
+    fm.templates_dir.mkdir(parents=True)
+    (fm.templates_dir / "feature-template.md").write_text("# [Feature Name]\n", encoding='utf-8')
+    feature_id = fm.create_feature("Login", "Sign in with email")
+    fm.move_feature(feature_id, 'active')
+    monkeypatch.setattr(fm, 'sync_index', lambda *args, **kwargs: pytest.fail("move synced the index"))
+
+    fm.move_feature(feature_id, 'review')
+    fm.move_feature(feature_id, 'complete')
+
+    assert list((fm.features_dir / "completed").glob(f"{feature_id}-*.md"))
+    assert not list((fm.features_dir / "active").glob(f"{feature_id}-*.md"))
+
+
+def _seed_backlog(fm, features=(), completed=(), epics=()):
+    """Write a backlog with the given records, bypassing create/move"""
+    data = fm.load_backlog()
+    data['backlog']['features'] = [dict(feature) for feature in features]
+    data['completed']['features'] = [dict(feature) for feature in completed]
+    data['backlog']['epics'] = [dict(epic) for epic in epics]
+    data['dependencies'] = None
+    fm.save_backlog(data)
+    return data
+
+
+def test_event_log_seeds_dates_as_utc_midnight(fm, monkeypatch):
+    monkeypatch.setenv('TZ', 'Asia/Tokyo')
+    time.tzset()
+    try:
+        _seed_backlog(fm, completed=[{'id': 'feat-001', 'name': 'Done', 'status': 'complete',
+                                      'createdDate': '2025-01-02', 'completedDate': '2025-01-10'}])
+        fm._ensure_event_log(fm.load_backlog())
+        events = list(fm._iter_events(10))
+    finally:
+        monkeypatch.delenv('TZ')
+        time.tzset()
+
+    assert [(e['timestamp'], e['toStatus']) for e in events] == [
+        ('2025-01-02T00:00:00+00:00', 'backlog'),
+        ('2025-01-10T00:00:00+00:00', 'complete'),
+    ]
+
+
+def test_event_append_realigns_columns_after_partial_write(fm):
+    _seed_backlog(fm)
+    fm._append_events([(100, 'feat-001', None, 'backlog')])
+    with open(fm.events_dir / "ts.bin", 'ab') as f:
+        f.write(b'\x01\x02\x03\x04\x05\x06\x07\x08\x09')  # A crash after one column was written
+    fm._append_events([(200, 'feat-002', None, 'backlog')])
+
+    assert [(e['featureId'], e['timestamp'][-14:]) for e in fm._iter_events(10)] == [
+        ('feat-001', '00:01:40+00:00'),
+        ('feat-002', '00:03:20+00:00'),
+    ]
+
+
+def test_analytics_on_fixed_event_log(fm, capsys):
+    pytest.importorskip('numpy')
+    day = 86400
+    _seed_backlog(fm, completed=[
+        {'id': 'feat-001', 'name': 'A', 'status': 'complete', 'epic': 'epic-001', 'estimatedHours': 8},
+        {'id': 'feat-002', 'name': 'B', 'status': 'complete', 'epic': 'epic-001', 'estimatedHours': 4},
+    ])
+    fm._append_events([
+        (0, 'feat-001', None, 'backlog'), (0, 'feat-002', None, 'backlog'),
+        (1 * day, 'feat-002', 'backlog', 'active'), (2 * day, 'feat-001', 'backlog', 'active'),
+        (3 * day, 'feat-002', 'active', 'complete'), (6 * day, 'feat-001', 'active', 'complete'),
+    ])
+
+    fm.show_analytics(weeks=4)
+    out = capsys.readouterr().out
+    assert "(6 events)" in out
+    assert "Lead time      p50    4.5d" in out
+    assert "Cycle time     p50    3.0d" in out
+
+    fm.show_analytics(epic='epic-404')
+    assert "Epic epic-404 not found" in capsys.readouterr().out
+
+
+def test_incremental_rollups_match_recompute(fm):
+    _seed_backlog(fm, epics=[{'id': 'epic-001', 'name': 'Accounts', 'features': []}])
+    login = fm.create_feature("Login", "Sign in with email", epic='epic-001', estimated_hours=10)
+    profile = fm.create_feature("Profile", "Edit the user profile", epic='epic-001', estimated_hours=6)
+    _edit_backlog(fm, lambda data: data['backlog']['epics'][0].update(features=[login, profile]))
+    fm.show_epics(rebuild=True)
+
+    fm.create_feature("Avatar", "Upload a profile picture", epic='epic-001', estimated_hours=4)
+    fm.move_feature(login, 'active')
+    fm.move_feature(login, 'complete')
+    fm.move_feature(profile, 'review')
+
+    data = fm.load_backlog()
+    epic = data['backlog']['epics'][0]
+    records = {f['id']: f for f in data['backlog']['features'] + data['completed']['features']}
+    assert epic['rollup'] == fm._compute_rollup(dict(epic), records)
+    assert epic['rollup']['completedHours'] == 10
+    assert 'projectedFinish' not in epic['rollup']
+    assert fm.check_epics(data) == []
+
+
+EXPORT_FEATURES = [
+    {'id': 'feat-001', 'name': 'Login', 'description': 'Sign in', 'status': 'backlog', 'priority': 'high',
+     'estimatedHours': 8, 'tags': ['auth', 'web']},
+    {'id': 'feat-002', 'name': 'Profile', 'description': 'Edit profile', 'status': 'active', 'priority': 'low',
+     'estimatedHours': 3, 'tags': []},
+]
+
+
+def _exported_rows(path, file_format):
+    """Read an export back as a list of {field: value} dicts"""
+    if file_format == 'csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+    if file_format == 'jsonl':
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+    if file_format == 'npz':
+        import numpy as np
+        with np.load(path) as archive:
+            columns = {field: archive[field].tolist() for field in archive.files}
+    else:
+        if file_format == 'parquet':
+            import pyarrow.parquet
+            table = pyarrow.parquet.read_table(path)
+        else:
+            import pyarrow.ipc
+            table = pyarrow.ipc.open_file(path).read_all()
+        columns = table.to_pydict()
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'jsonl', 'parquet', 'arrow', 'npz'])
+def test_export_round_trip(fm, tmp_path, file_format):
+    if file_format in ('parquet', 'arrow'):
+        pytest.importorskip('pyarrow')
+    if file_format == 'npz':
+        pytest.importorskip('numpy')
+    _seed_backlog(fm, features=EXPORT_FEATURES)
+    output = tmp_path / f"features.{file_format}"
+
+    assert fm.export(file_format, fields=['id', 'estimatedHours', 'tags'], output=str(output), chunk_size=1)
+
+    rows = _exported_rows(output, file_format)
+    assert [row['id'] for row in rows] == ['feat-001', 'feat-002']
+    assert [float(row['estimatedHours']) for row in rows] == [8.0, 3.0]
+    tags = [row['tags'] for row in rows]
+    if file_format in ('csv', 'npz'):
+        assert tags == ['auth;web', '']
+    else:
+        assert tags == [['auth', 'web'], []]
+
+
+def test_npz_export_writes_and_reports_npz_path(fm, tmp_path, capsys):
+    pytest.importorskip('numpy')
+    _seed_backlog(fm, features=EXPORT_FEATURES)
+
+    assert fm.export('npz', output=str(tmp_path / "history.parquet"))
+
+    assert (tmp_path / "history.npz").exists()
+    assert not (tmp_path / "history.parquet").exists()
+    assert f"to {tmp_path / 'history.npz'} (npz)" in capsys.readouterr().out
+
+
+def test_export_rejects_unknown_fields_and_epic_text_filters(fm, tmp_path, capsys):
+    _seed_backlog(fm, features=EXPORT_FEATURES)
+    output = tmp_path / "out.csv"
+
+    assert not fm.export('csv', fields=['id', 'bogus'], output=str(output))
+    assert "Unknown features fields: bogus" in capsys.readouterr().out
+    assert not fm.export('csv', entity='epics', output=str(output), text='login')
+    assert not output.exists()
+
+
+def test_report_rerenders_only_changed_pages(fm, tmp_path, capsys):
+    ids = [fm.create_feature(f"Feature {n}", f"Description {n}") for n in range(3)]
+    output = tmp_path / "report"
+    fm.generate_report(output=str(output))
+    capsys.readouterr()
+
+    fm.generate_report(output=str(output))
+    assert "Rendered 0 of" in capsys.readouterr().out
+
+    # The moved feature's page, both status boards and the overview
+    for path in output.rglob('*.html'):
+        path.write_text('stale', encoding='utf-8')
+    fm.move_feature(ids[1], 'active')
+    fm.generate_report(output=str(output))
+    assert "Rendered 4 of" in capsys.readouterr().out
+    touched = {path.relative_to(output).as_posix() for path in output.rglob('*.html')
+               if path.read_text(encoding='utf-8') != 'stale'}
+    assert touched == {f"features/{ids[1]}.html", "status/backlog.html", "status/active.html", "index.html"}
+
+
+def test_forced_report_prunes_removed_pages(fm, tmp_path, capsys):
+    ids = [fm.create_feature(f"Feature {n}", f"Description {n}") for n in range(3)]
+    output = tmp_path / "report"
+    fm.generate_report(output=str(output))
+
+    _edit_backlog(fm, lambda data: data['backlog']['features'].remove(_feature(data, ids[0])))
+    capsys.readouterr()
+    fm.generate_report(output=str(output), force=True)
+
+    assert not (output / "features" / f"{ids[0]}.html").exists()
+    assert (output / "features" / f"{ids[1]}.html").exists()
+    manifest = json.loads((output / ".manifest.json").read_text(encoding='utf-8'))
+    assert f"features/{ids[0]}.html" not in manifest
+    assert "Rendered" in capsys.readouterr().out
+
+
+def test_cjk_features_compared_by_content(fm):
+    export = fm.create_feature("数据导出", "将全部数据导出为表格文件")
+    fm.create_feature("用户登录", "使用邮箱和密码登录系统")
+
+    assert fm.find_duplicate_clusters() == []
+    assert [feature_id for _, feature_id in fm.find_duplicates("数据导出", "将全部数据导出为表格")] == [export]
+    assert fm.find_duplicates("用户注销", "退出当前账户") == []
+
+
+def test_text_without_words_never_matches(fm):
+    fm.create_feature("!!!", "---")
+    fm.create_feature("???", "...")
+
+    assert fm.find_duplicates("", "") == []
+    assert fm.find_duplicates("!!!", "---") == []
+    assert fm.find_duplicate_clusters() == []
+
+
+def _expected_top(fm, k, epic=None):
+    """Top-k by a full scan of the backlog, the way the priority queue should rank it"""
+    weights = fm._ranking_weights()
+    eligible = [f for f in fm.load_backlog()['backlog']['features']
+                if f.get('status') != 'complete' and not f.get('owner') and (epic is None or f.get('epic') == epic)]
+    ranked = sorted(eligible, key=lambda f: -fm._wsjf_score(f, weights))
+    return [f['id'] for f in ranked[:k]]
+
+
+def test_top_features_follow_moves_and_owner_changes(fm):
+    today = time.strftime('%Y-%m-%d')
+    _seed_backlog(fm, features=[
+        {'id': f'feat-00{n}', 'name': f'Feature {n}', 'status': 'backlog', 'priority': 'medium',
+         'estimatedHours': 2 ** n, 'createdDate': today, 'epic': 'epic-1' if n % 2 else None}
+        for n in range(1, 6)
+    ])
+    assert [fid for _, fid in fm.top_features(3)] == _expected_top(fm, 3) == ['feat-001', 'feat-002', 'feat-003']
+
+    fm.move_feature('feat-001', 'complete')
+    _edit_backlog(fm, lambda data: _feature(data, 'feat-002').update(owner='alice'))
+
+    assert [fid for _, fid in fm.top_features(3)] == _expected_top(fm, 3) == ['feat-003', 'feat-004', 'feat-005']
+    assert [fid for _, fid in fm.top_features(5, epic='epic-1')] == _expected_top(fm, 5, 'epic-1')
+    assert _expected_top(fm, 5, 'epic-1') == ['feat-003', 'feat-005']
+
+
+def test_schedule_rejects_non_positive_hours_per_day(fm, tmp_path, capsys):
+    fm.create_feature("Login", "Sign in with email")
+
+    assert fm.show_dependencies('schedule', hours_per_day=0) is False
+    assert "Hours per day must be greater than 0" in capsys.readouterr().out
+
+    result = subprocess.run([sys.executable, str(SCRIPT), 'deps', 'critical-path', '--hours-per-day', '0'],
+                            cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "must be greater than 0" in result.stderr
+
+
+def test_portfolio_reports_broken_repo_and_skips_cached_ones(fm, tmp_path, capsys):
+    repos = tmp_path / "repos"
+    for name, count in (('alpha', 2), ('beta', 1)):
+        repo = feature_manager.FeatureManager(repos / name)
+        for n in range(count):
+            repo.create_feature(f"{name} {n}", f"Description {n}")
+    broken = feature_manager.FeatureManager(repos / "broken")
+    broken.backlog_file.parent.mkdir(parents=True)
+    broken.backlog_file.write_text('{"backlog": ', encoding='utf-8')
+    capsys.readouterr()
+
+    fm.show_portfolio(pattern=str(repos / "*"), jobs=1)
+    out = capsys.readouterr().out
+    assert "❌ broken: failed to load backlog (JSONDecodeError" in out
+    assert "Portfolio (2 repositories, 3 re-parsed)" in out
+    assert "3 backlog" in out.split("Total")[1]
+
+    # Failures are not cached, so only the broken repository is parsed again
+    assert fm.load_portfolio(pattern=str(repos / "*"), jobs=1)[1] == 1
+
+    feature_manager.FeatureManager(repos / "alpha").create_feature("alpha 2", "Description 2")
+    shutil.rmtree(broken.project_root)
+    summaries, parsed = fm.load_portfolio(pattern=str(repos / "*"), jobs=1)
+    assert parsed == 1
+    assert {name: summary['metrics']['backlogFeatures'] for name, summary in summaries} == {'alpha': 3, 'beta': 1}